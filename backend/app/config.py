@@ -9,14 +9,110 @@ load_dotenv()
 # Database settings
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/miabc.db")
 
+# Cold attempt history moved out by scripts/archive_attempts.py. On SQLite the archive
+# is a separate database file attached to every connection as the "archive" schema
+# (default: next to the main file, e.g. data/miabc-archive.db); on PostgreSQL it is
+# an "archive" schema in the same database
+ARCHIVE_DATABASE_PATH = os.getenv("ARCHIVE_DATABASE_PATH", "")
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "5000"))
+
+# Create missing tables, columns and indexes on startup; disable once the schema
+# is managed with scripts/init_database.py to skip the checks on every worker boot
+AUTO_CREATE_SCHEMA = os.getenv("AUTO_CREATE_SCHEMA", "true").lower() in ("1", "true", "yes")
+
+# Connection pool sizing
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Server-side prepared statements cached per PostgreSQL connection (asyncpg)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# SQLite pragmas applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))
 
+# Password hashing process pool; requests beyond workers + queue size get 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "64"))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "2"))
+
+# Maximum learners accepted by one POST /api/register/bulk request
+REGISTER_BULK_MAX_ROWS = int(os.getenv("REGISTER_BULK_MAX_ROWS", "1000"))
+
+# Cache of verified tokens used by get_current_principal. Cached tokens are checked
+# against the revocation copy below, so a revocation handled by another worker is
+# honoured within AUTH_REVOCATION_REFRESH_SECONDS rather than the cache TTL
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "4096"))
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+
+# Stateless mode trusts the token claims and checks revocation against an in-memory
+# copy of users.tokenVersion refreshed every AUTH_REVOCATION_REFRESH_SECONDS (this
+# copy also guards cached tokens in the default mode)
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() in ("1", "true", "yes")
+AUTH_REVOCATION_REFRESH_SECONDS = int(os.getenv("AUTH_REVOCATION_REFRESH_SECONDS", "30"))
+
 # Firebase settings
 FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH", "firebase-credentials.json")
 FIREBASE_STORAGE_BUCKET = os.getenv("FIREBASE_STORAGE_BUCKET", "miabc-a2e3a.appspot.com")
 
+# Prefix that word media keys are expanded against in API responses
+MEDIA_BASE_URL = os.getenv(
+    "MEDIA_BASE_URL",
+    f"https://firebasestorage.googleapis.com/v0/b/{FIREBASE_STORAGE_BUCKET}/o/"
+)
+
+# Word catalog HTTP caching (seconds clients may reuse a response before revalidating)
+WORDS_CACHE_MAX_AGE = int(os.getenv("WORDS_CACHE_MAX_AGE", "60"))
+
+# Seconds a worker serves its in-memory word catalog before re-reading catalogVersion
+# to pick up writes made by other workers or scripts (0 checks on every request)
+CATALOG_VERSION_CHECK_SECONDS = float(os.getenv("CATALOG_VERSION_CHECK_SECONDS", "1"))
+
+# Cursor pagination page sizes
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+WORDS_MAX_PAGE_SIZE = int(os.getenv("WORDS_MAX_PAGE_SIZE", "1000"))
+
+# Rows fetched per round trip when streaming GET /api/export/history
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "500"))
+
+# Maximum number of upserts plus deletes accepted by POST /api/words/bulk
+WORDS_BULK_MAX_ITEMS = int(os.getenv("WORDS_BULK_MAX_ITEMS", "2000"))
+
+# Maximum number of events accepted by one POST /api/events/batch request
+EVENTS_BATCH_MAX_ITEMS = int(os.getenv("EVENTS_BATCH_MAX_ITEMS", "500"))
+
+# POST /api/sync/journal: maximum entries per request and entries committed per transaction
+SYNC_JOURNAL_MAX_ENTRIES = int(os.getenv("SYNC_JOURNAL_MAX_ENTRIES", "5000"))
+SYNC_JOURNAL_COMMIT_SIZE = int(os.getenv("SYNC_JOURNAL_COMMIT_SIZE", "1000"))
+
+# Write-behind logging of quiz and pronunciation attempts: rows are queued and
+# inserted in batches of up to WRITE_BEHIND_BATCH_SIZE, at least every
+# WRITE_BEHIND_FLUSH_INTERVAL_MS; a full queue falls back to a synchronous insert
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "false").lower() in ("1", "true", "yes")
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "10000"))
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "500"))
+WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_MS", "200"))
+
+# Per-request SQL instrumentation: Server-Timing header, logs and N+1 detection.
+# A statement run QUERY_REPEAT_THRESHOLD times in one request is reported as N+1;
+# QUERY_STRICT_MODE turns that into a 500 response (meant for tests)
+QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+QUERY_STRICT_MODE = os.getenv("QUERY_STRICT_MODE", "false").lower() in ("1", "true", "yes")
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "3"))
+
 # CORS settings
 CORS_ORIGINS = ["*"]  # In production, specify exact origins
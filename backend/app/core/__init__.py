@@ -2,13 +2,41 @@
 from app.core.security import (
     verify_password,
     get_password_hash,
+    password_hasher,
     create_access_token,
     decode_token,
 )
 from app.core.firebase import (
     init_firebase,
+    is_firebase_available,
     upload_image_to_firebase,
     upload_audio_to_firebase,
     delete_from_firebase,
     get_firebase_url,
 )
+from app.core.pagination import (
+    encode_cursor,
+    decode_cursor,
+    paginate_query,
+    merge_pages,
+    paginate_sorted,
+)
+from app.core.search import (
+    init_word_search,
+    search_word_ids,
+)
+from app.core.media import (
+    MEDIA_FIELDS,
+    MEDIA_KEYS_CONTEXT,
+    to_media_key,
+    resolve_media_url,
+)
+from app.core.instrumentation import (
+    QueryStats,
+    QueryInstrumentationMiddleware,
+    install_query_listeners,
+)
+from app.core.write_behind import (
+    WriteBehindBuffer,
+    attempt_buffer,
+)
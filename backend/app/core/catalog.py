@@ -0,0 +1,195 @@
+"""
+In-memory Word Catalog
+
+The word catalog is small, rarely changes and is read on nearly every app
+screen, so the public word endpoints are served from an immutable snapshot
+kept in process memory instead of querying the database on every request.
+Other workers and scripts also write words, so the snapshot's version is
+compared with the catalogVersion row every CATALOG_VERSION_CHECK_SECONDS and
+the snapshot is rebuilt when it has moved on.
+"""
+import asyncio
+import hashlib
+import time
+from types import MappingProxyType
+from typing import List, NamedTuple, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import CATALOG_VERSION_CHECK_SECONDS
+from app.models import OriginalWord, CatalogVersion
+from app.core.media import MEDIA_KEYS_CONTEXT
+from app.schemas import Word
+
+word_list_adapter = TypeAdapter(List[Word])
+
+# Fields belonging to each language; fields not listed here are shared by all languages
+LANGUAGE_FIELDS = {
+    "english": ("englishName", "englishSound"),
+    "spanish": ("spanishName", "spanishSound"),
+    "tamil": ("tamilWord", "tamilPronunciation"),
+}
+
+# Distinct projections of the full word list cached per snapshot
+_PROJECTION_CACHE_SIZE = 32
+
+
+class WordProjection(NamedTuple):
+    """Shape of serialized words: which fields to keep and whether media stays as storage keys"""
+    fields: Optional[frozenset] = None
+    media_keys: bool = False
+
+
+FULL_PROJECTION = WordProjection()
+
+
+def _group_by(words, attribute: str) -> MappingProxyType:
+    """Build a read-only index of words keyed by one of their attributes"""
+    groups = {}
+    for word in words:
+        value = getattr(word, attribute)
+        if value is not None:
+            groups.setdefault(value, []).append(word)
+    return MappingProxyType({value: tuple(items) for value, items in groups.items()})
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the word catalog with prebuilt secondary indexes.
+
+    The full word list is serialized once per snapshot; its digest together
+    with the catalog version forms the strong ETag shared by all word reads.
+    """
+
+    __slots__ = (
+        "version", "etag", "words", "keys", "words_json", "_projections",
+        "by_id", "by_initials", "by_type", "by_tema", "by_letra",
+    )
+
+    def __init__(self, words, version: int):
+        self.version = version
+        self.words = tuple(words)
+        self.keys = tuple((word.createdAt, word.id) for word in self.words)
+        self.words_json = word_list_adapter.dump_json(list(self.words))
+        digest = hashlib.sha256(self.words_json).hexdigest()[:16]
+        self.etag = f'"{version}-{digest}"'
+        self._projections = {}
+        self.by_id = MappingProxyType({word.id: word for word in self.words})
+        self.by_initials = _group_by(self.words, "initials")
+        self.by_type = _group_by(self.words, "type")
+        self.by_tema = _group_by(self.words, "tema")
+        self.by_letra = _group_by(self.words, "letra")
+
+    def serialize(self, words, projection: WordProjection = FULL_PROJECTION) -> bytes:
+        """
+        Serialize words from this snapshot to JSON in the requested projection.
+
+        Projections of the full word list are cached, so single-language clients
+        pay for their smaller payload only once per catalog version.
+        """
+        if words is not self.words:
+            return _dump_words(words, projection)
+        if projection == FULL_PROJECTION:
+            return self.words_json
+        body = self._projections.get(projection)
+        if body is None:
+            body = _dump_words(words, projection)
+            if len(self._projections) < _PROJECTION_CACHE_SIZE:
+                self._projections[projection] = body
+        return body
+
+
+def _dump_words(words, projection: WordProjection) -> bytes:
+    """Serialize words to a JSON array in the given projection"""
+    include = {"__all__": set(projection.fields)} if projection.fields is not None else None
+    context = MEDIA_KEYS_CONTEXT if projection.media_keys else None
+    return word_list_adapter.dump_json(list(words), include=include, context=context)
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_checked_at = 0.0  # time.monotonic() of the last version check
+_lock = asyncio.Lock()
+
+
+def get_catalog_version(db: Session) -> int:
+    """
+    Read the current catalog version (0 before the first word write).
+
+    Like bump_catalog_version this takes a sync session so scripts can call it
+    directly; async routes run it with AsyncSession.run_sync.
+    """
+    version = db.query(CatalogVersion.version).filter(CatalogVersion.id == 1).scalar()
+    return version or 0
+
+
+def bump_catalog_version(db: Session) -> int:
+    """
+    Allocate the next catalog version inside the caller's write transaction.
+
+    The counter row is updated before any word row, so the write lock it takes
+    orders concurrent writers: versions are handed out in commit order and a
+    client that synced up to version N can never miss a change stamped <= N.
+    """
+    version = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1)
+        .returning(CatalogVersion.version)
+    ).scalar()
+    if version is None:
+        version = 1
+        db.add(CatalogVersion(id=1, version=version))
+        db.flush()
+    return version
+
+
+def _load_snapshot(db: Session) -> CatalogSnapshot:
+    """Read every live word and the catalog version into a new snapshot"""
+    version = get_catalog_version(db)
+    rows = db.query(OriginalWord).filter(
+        OriginalWord.deletedAt.is_(None)
+    ).order_by(OriginalWord.createdAt, OriginalWord.id).populate_existing().all()
+    return CatalogSnapshot((Word.model_validate(row) for row in rows), version)
+
+
+async def get_catalog(db: AsyncSession, revalidate: bool = False) -> CatalogSnapshot:
+    """
+    Get the current catalog snapshot, loading it on first use.
+
+    Within CATALOG_VERSION_CHECK_SECONDS of the last check the snapshot is
+    returned without touching the session; after that, or with revalidate=True,
+    the catalog version is read (a primary key lookup) and the snapshot is
+    rebuilt if another worker or a script has changed the words since.
+    """
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    if snapshot is not None:
+        now = time.monotonic()
+        if not revalidate and now - _checked_at < CATALOG_VERSION_CHECK_SECONDS:
+            return snapshot
+        _checked_at = now
+        if await db.run_sync(get_catalog_version) == snapshot.version:
+            return snapshot
+    async with _lock:
+        # Whoever got the lock first has already replaced the outdated snapshot
+        if _snapshot is snapshot:
+            _snapshot = await db.run_sync(_load_snapshot)
+            _checked_at = time.monotonic()
+        return _snapshot
+
+
+async def rebuild_catalog(db: AsyncSession) -> CatalogSnapshot:
+    """
+    Rebuild the snapshot after a committed write and swap it in atomically.
+
+    Loading happens under the lock so that concurrent writers always leave
+    the snapshot of whichever commit was read last in place.
+    """
+    global _snapshot, _checked_at
+    async with _lock:
+        _snapshot = await db.run_sync(_load_snapshot)
+        _checked_at = time.monotonic()
+        return _snapshot
@@ -1,44 +1,68 @@
 """
 Firebase Storage Integration
+
+firebase_admin and the Google Cloud Storage client are slow to import, so
+they are imported and initialized on first storage use instead of at startup.
 """
-import firebase_admin
-from firebase_admin import credentials, storage
-import os
 import base64
-from io import BytesIO
+import logging
+import os
+import threading
 
 from app.config import FIREBASE_CREDENTIALS_PATH, FIREBASE_STORAGE_BUCKET
 
+logger = logging.getLogger(__name__)
+
+_bucket = None
+_initialized = False
+_lock = threading.Lock()
+
 
 def init_firebase():
-    """Initialize Firebase Admin SDK with credentials"""
-    try:
-        # Check if Firebase is already initialized
-        if not firebase_admin._apps:
-            if os.path.exists(FIREBASE_CREDENTIALS_PATH):
+    """Initialize Firebase Admin SDK with credentials, once per process"""
+    global _bucket, _initialized
+    if _initialized:
+        return _bucket
+    with _lock:
+        if _initialized:
+            return _bucket
+        try:
+            import firebase_admin
+            from firebase_admin import credentials, storage
+            
+            # Check if Firebase is already initialized
+            if not firebase_admin._apps:
+                if not os.path.exists(FIREBASE_CREDENTIALS_PATH):
+                    logger.warning(
+                        "Firebase credentials not found at %s; storage features are disabled",
+                        FIREBASE_CREDENTIALS_PATH
+                    )
+                    return None
                 cred = credentials.Certificate(FIREBASE_CREDENTIALS_PATH)
                 firebase_admin.initialize_app(cred, {
                     'storageBucket': FIREBASE_STORAGE_BUCKET
                 })
-                print("✅ Firebase initialized successfully")
-            else:
-                print(f"⚠️ Firebase credentials not found at {FIREBASE_CREDENTIALS_PATH}")
-                print("Firebase storage features will be disabled")
-                return None
-        
-        return storage.bucket()
-    except Exception as e:
-        print(f"⚠️ Firebase initialization error: {e}")
-        print("Continuing without Firebase storage")
-        return None
+                logger.info("Firebase initialized successfully")
+            
+            _bucket = storage.bucket()
+            return _bucket
+        except Exception as e:
+            logger.warning("Firebase initialization error: %s; continuing without storage", e)
+            return None
+        finally:
+            _initialized = True
+
+
+def is_firebase_available() -> bool:
+    """Whether storage is usable, judged by the credentials file until Firebase is initialized"""
+    if _initialized:
+        return _bucket is not None
+    return os.path.exists(FIREBASE_CREDENTIALS_PATH)
 
 
 def get_bucket():
-    """Get Firebase Storage bucket"""
-    try:
-        return storage.bucket()
-    except:
-        return None
+    """Get Firebase Storage bucket, initializing Firebase on first use"""
+    return init_firebase()
 
 
 def upload_image_to_firebase(image_data: str, path: str) -> str:
@@ -72,7 +96,7 @@ def upload_image_to_firebase(image_data: str, path: str) -> str:
         return blob.public_url
     
     except Exception as e:
-        print(f"Error uploading to Firebase: {e}")
+        logger.error("Error uploading to Firebase: %s", e)
         return image_data  # Return original on error
 
 
@@ -102,7 +126,7 @@ def upload_audio_to_firebase(audio_data: bytes, path: str, content_type: str = '
         return blob.public_url
     
     except Exception as e:
-        print(f"Error uploading audio to Firebase: {e}")
+        logger.error("Error uploading audio to Firebase: %s", e)
         return ""
 
 
@@ -126,7 +150,7 @@ def delete_from_firebase(path: str) -> bool:
         return True
     
     except Exception as e:
-        print(f"Error deleting from Firebase: {e}")
+        logger.error("Error deleting from Firebase: %s", e)
         return False
 
 
@@ -150,5 +174,5 @@ def get_firebase_url(path: str) -> str:
         return blob.public_url
     
     except Exception as e:
-        print(f"Error getting Firebase URL: {e}")
+        logger.error("Error getting Firebase URL: %s", e)
         return ""
@@ -0,0 +1,179 @@
+"""
+Per-request SQL Instrumentation
+
+Cursor events on the engine add every statement to the stats of the request
+being served, found through a context variable, so the counts hold for both
+sync and async sessions. The middleware reports them in a Server-Timing
+header and the log, and flags statements repeated within one request (the
+typical N+1 pattern of querying inside a loop).
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_SERVER_TIMING_HEADER = b"server-timing"
+
+
+class QueryStats:
+    """Statements executed while serving one request"""
+
+    __slots__ = ("count", "total_seconds", "slowest_seconds", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float, new_execution: bool = True, batched: bool = False):
+        """
+        Add a cursor execution; continued rounds of one executemany only add their time.
+        
+        Batched statements (executemany, or run with the batched=True execution
+        option) are not counted towards repeats, since a large batch sent in
+        chunks is deliberate rather than an N+1 pattern.
+        """
+        self.total_seconds += seconds
+        if new_execution:
+            self.count += 1
+            if not batched:
+                self.statements[statement] += 1
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int):
+        """Get (statement, executions) of the most repeated statement if it reached the threshold"""
+        if not self.statements:
+            return None
+        statement, executions = self.statements.most_common(1)[0]
+        return (statement, executions) if executions >= threshold else None
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.1f}"
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _summarize(statement: str, length: int = 200) -> str:
+    """Collapse whitespace and shorten a statement for logs and error bodies"""
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length - 3] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is not None and started_at is not None:
+        # An executemany that SQLAlchemy sends in several rounds (insertmanyvalues)
+        # shares one execution context and is counted as a single statement
+        stats.record(
+            statement, time.perf_counter() - started_at,
+            new_execution=not getattr(context, "_query_recorded", False),
+            batched=context.executemany or context.execution_options.get("batched", False)
+        )
+        context._query_recorded = True
+
+
+def install_query_listeners(engine: Engine):
+    """Time every statement run through the engine (pass async_engine.sync_engine for async engines)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Pure ASGI middleware reporting the SQL cost of each HTTP request.
+
+    Adds a Server-Timing header with the query count, total database time and
+    slowest statement, and logs the same. A statement executed repeat_threshold
+    times or more in one request is logged as a likely N+1 pattern; in strict
+    mode (for tests) the request fails with 500 instead, as long as the response
+    has not started yet.
+    """
+
+    def __init__(self, app, strict: bool = False, repeat_threshold: int = 3):
+        self.app = app
+        self.strict = strict
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        state = {"status": None, "rejected": False}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                repeated = stats.repeated(self.repeat_threshold)
+                if self.strict and repeated:
+                    state["rejected"] = True
+                    await self._reject(send, stats, *repeated)
+                    return
+                state["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((_SERVER_TIMING_HEADER, stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            elif state["rejected"]:
+                # The N+1 error was already sent in place of this response
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._log(scope, state["status"] or 500, stats)
+
+    async def _reject(self, send, stats: QueryStats, statement: str, executions: int):
+        body = json.dumps({
+            "detail": f"N+1 query pattern: statement executed {executions} times in one request",
+            "statement": _summarize(statement),
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 500,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (_SERVER_TIMING_HEADER, stats.server_timing().encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def _log(self, scope, status: int, stats: QueryStats):
+        if stats.count == 0:
+            return
+        logger.info(
+            "%s %s %d: %d queries, %.1f ms in database, slowest %.1f ms: %s",
+            scope["method"], scope["path"], status, stats.count, stats.total_seconds * 1000,
+            stats.slowest_seconds * 1000, _summarize(stats.slowest_statement)
+        )
+        repeated = stats.repeated(self.repeat_threshold)
+        if repeated:
+            logger.warning(
+                "Possible N+1 in %s %s: statement executed %d times: %s",
+                scope["method"], scope["path"], repeated[1], _summarize(repeated[0])
+            )
@@ -0,0 +1,41 @@
+"""
+Media Storage Keys
+
+Word media columns store only the Firebase Storage object key (for example
+"audio/fan.mp3") instead of the full download URL, which repeats the same
+bucket prefix on every row. Keys are expanded against MEDIA_BASE_URL when
+responses are serialized.
+"""
+from typing import Optional
+from urllib.parse import quote, unquote, urlsplit
+
+from app.config import MEDIA_BASE_URL
+
+# Word columns that hold media references
+MEDIA_FIELDS = ("englishSound", "spanishSound", "imagePath")
+
+# Serialization context that keeps media as storage keys, used when writing to the database
+MEDIA_KEYS_CONTEXT = {"media": "keys"}
+
+
+def to_media_key(value: Optional[str]) -> Optional[str]:
+    """
+    Reduce a Firebase Storage download URL for our bucket to its object key.
+
+    URLs for other hosts or buckets, and URLs carrying a download token, are
+    returned unchanged because they cannot be rebuilt from the key alone.
+    """
+    if not value or not value.startswith(MEDIA_BASE_URL):
+        return value
+    parts = urlsplit(value)
+    params = [param for param in parts.query.split("&") if param]
+    if any(param != "alt=media" for param in params):
+        return value
+    return unquote(value[len(MEDIA_BASE_URL):].split("?", 1)[0])
+
+
+def resolve_media_url(value: Optional[str]) -> Optional[str]:
+    """Expand an object key to its download URL; full URLs and data URIs pass through"""
+    if not value or "://" in value or value.startswith("data:"):
+        return value
+    return f"{MEDIA_BASE_URL}{quote(value, safe='')}?alt=media"
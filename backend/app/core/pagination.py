@@ -0,0 +1,105 @@
+"""
+Keyset (cursor) Pagination
+
+List endpoints page on (createdAt, id) so that every page is an index range
+scan instead of an ever-growing OFFSET. Cursors are opaque to clients and the
+cursor for the next page is returned in the X-Next-Cursor response header.
+"""
+import base64
+import bisect
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (createdAt, id) position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate_query(
+    db: AsyncSession,
+    statement: Select,
+    model,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False
+):
+    """
+    Fetch one page of a select() of ORM entities ordered by (createdAt, id).
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    """
+    key = tuple_(model.createdAt, model.id)
+    if cursor:
+        position = tuple_(*decode_cursor(cursor))
+        statement = statement.where(key < position if descending else key > position)
+
+    if descending:
+        statement = statement.order_by(model.createdAt.desc(), model.id.desc())
+    else:
+        statement = statement.order_by(model.createdAt, model.id)
+
+    rows = (await db.scalars(statement.limit(limit + 1))).all()
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return rows[:limit], encode_cursor(last.createdAt, last.id)
+    return rows, None
+
+
+def merge_pages(pages: Sequence[Tuple[Sequence, Optional[str]]], limit: int, descending: bool = False):
+    """
+    Combine pages of the same cursor position from tables holding disjoint rows.
+
+    Each page is a (rows, next_cursor) result of paginate_query with the same
+    cursor and limit. The rows are merged on (createdAt, id) and cut to limit.
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    """
+    rows = sorted(
+        (row for page_rows, _ in pages for row in page_rows),
+        key=lambda row: (row.createdAt, row.id),
+        reverse=descending
+    )
+    if len(rows) > limit or any(next_cursor for _, next_cursor in pages):
+        last = rows[min(limit, len(rows)) - 1]
+        return rows[:limit], encode_cursor(last.createdAt, last.id)
+    return rows, None
+
+
+def paginate_sorted(items: Sequence, keys: Sequence, cursor: Optional[str], limit: int):
+    """
+    Fetch one page of an in-memory sequence already sorted ascending by keys.
+
+    Returns:
+        Tuple of (items, next_cursor); next_cursor is None on the last page
+    """
+    start = bisect.bisect_right(keys, decode_cursor(cursor)) if cursor else 0
+    end = start + limit
+    if end < len(items):
+        created_at, row_id = keys[end - 1]
+        return items[start:end], encode_cursor(created_at, row_id)
+    return items[start:], None
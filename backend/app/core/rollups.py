@@ -0,0 +1,103 @@
+"""
+Incrementally Maintained Analytics Rollups
+
+Every write of progress rows or sessions also adds its totals to the learner's
+moduleRollups and sessionRollups rows with an upsert in the same transaction,
+so the analytics overview reads a handful of rows by primary key instead of
+aggregating the whole history. The *_totals() selects compute the same rows
+from the raw tables; scripts/check_rollups.py compares and rebuilds with them.
+"""
+from datetime import datetime
+from typing import Iterable, Mapping, Optional
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models import LearnerProgress, LearningSession, ModuleRollup, SessionRollup
+
+MODULE_COUNTS = ("attempts", "scoredAttempts", "scoreSum", "completedCount", "timeSpent")
+SESSION_COUNTS = ("sessions", "totalTimeSpent")
+
+
+def _later(column, new_value):
+    """The later of a stored timestamp and the incoming one (NULL counts as earliest)"""
+    return case((column.is_(None), new_value), (new_value > column, new_value), else_=column)
+
+
+def _upsert(bind, model, key: list, counts: tuple, timestamp: str):
+    """Insert a rollup row, or add the counts to the existing one and keep the later timestamp"""
+    statement = dialect_insert(bind)(model)
+    excluded = statement.excluded
+    update = {name: getattr(model, name) + excluded[name] for name in counts}
+    update[timestamp] = _later(getattr(model, timestamp), excluded[timestamp])
+    return statement.on_conflict_do_update(index_elements=key, set_=update)
+
+
+def module_rollup_rows(user_id: int, progress_rows: Iterable[Mapping]) -> list:
+    """Total new progress rows (mappings of LearnerProgress columns, including createdAt) per module"""
+    totals = {}
+    for row in progress_rows:
+        total = totals.setdefault(row["moduleName"], {
+            "userId": user_id, "moduleName": row["moduleName"], "lastActivityAt": None,
+            **{name: 0 for name in MODULE_COUNTS}
+        })
+        score = row.get("score")
+        created_at = row["createdAt"]
+        total["attempts"] += 1
+        if score is not None:
+            total["scoredAttempts"] += 1
+            total["scoreSum"] += score
+        if row.get("completed") == 1:
+            total["completedCount"] += 1
+        total["timeSpent"] += row.get("timeSpent") or 0
+        if total["lastActivityAt"] is None or created_at > total["lastActivityAt"]:
+            total["lastActivityAt"] = created_at
+    return list(totals.values())
+
+
+async def add_progress_to_rollups(db: AsyncSession, user_id: int, progress_rows: Iterable[Mapping]):
+    """Add newly written progress rows to the learner's module rollups (caller commits)"""
+    rows = module_rollup_rows(user_id, progress_rows)
+    if rows:
+        statement = _upsert(db.bind, ModuleRollup, ["userId", "moduleName"], MODULE_COUNTS, "lastActivityAt")
+        # Runs once per committed chunk of a journal sync, which is not an N+1 pattern
+        await db.execute(statement.execution_options(batched=True), rows)
+
+
+async def add_session_to_rollups(
+    db: AsyncSession,
+    user_id: int,
+    sessions: int = 0,
+    time_spent: int = 0,
+    session_at: Optional[datetime] = None
+):
+    """Add started sessions or a change of session time to the learner's session rollup (caller commits)"""
+    statement = _upsert(db.bind, SessionRollup, ["userId"], SESSION_COUNTS, "lastSessionAt")
+    await db.execute(statement, {
+        "userId": user_id, "sessions": sessions, "totalTimeSpent": time_spent, "lastSessionAt": session_at
+    })
+
+
+def module_totals() -> Select:
+    """Select moduleRollups rows computed from the raw learnerProgress rows"""
+    return select(
+        LearnerProgress.userId,
+        LearnerProgress.moduleName,
+        func.count(LearnerProgress.id).label("attempts"),
+        func.count(LearnerProgress.score).label("scoredAttempts"),
+        func.coalesce(func.sum(LearnerProgress.score), 0).label("scoreSum"),
+        func.coalesce(func.sum(case((LearnerProgress.completed == 1, 1), else_=0)), 0).label("completedCount"),
+        func.coalesce(func.sum(LearnerProgress.timeSpent), 0).label("timeSpent"),
+        func.max(LearnerProgress.createdAt).label("lastActivityAt"),
+    ).group_by(LearnerProgress.userId, LearnerProgress.moduleName)
+
+
+def session_totals() -> Select:
+    """Select sessionRollups rows computed from the raw learningSessions rows"""
+    return select(
+        LearningSession.userId,
+        func.count(LearningSession.id).label("sessions"),
+        func.coalesce(func.sum(LearningSession.totalTimeSpent), 0).label("totalTimeSpent"),
+        func.max(LearningSession.createdAt).label("lastSessionAt"),
+    ).group_by(LearningSession.userId)
@@ -0,0 +1,149 @@
+"""
+Multilingual Word Search
+
+Full-text and prefix search over the English, Spanish and Tamil word names,
+backed by an SQLite FTS5 index that triggers keep in sync with originalWords.
+The unicode61 tokenizer folds case and strips diacritics, so "lapiz" finds
+"Lápiz", while Tamil text is indexed as whole words that prefix queries match.
+
+Other databases fall back to case-insensitive word-prefix matching with
+ILIKE, which does not fold diacritics or rank results.
+"""
+from typing import Iterable, List, Optional
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import OriginalWord
+
+SEARCH_TABLE = "wordSearch"
+
+# Column searched for each language accepted by the search endpoint
+SEARCH_COLUMNS = {
+    "english": "englishName",
+    "spanish": "spanishName",
+    "tamil": "tamilWord",
+}
+
+_SEARCH_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS originalWords_search_insert AFTER INSERT ON originalWords BEGIN
+        INSERT INTO wordSearch(rowid, englishName, spanishName, tamilWord)
+        VALUES (new.id, new.englishName, new.spanishName, new.tamilWord);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS originalWords_search_delete AFTER DELETE ON originalWords BEGIN
+        INSERT INTO wordSearch(wordSearch, rowid, englishName, spanishName, tamilWord)
+        VALUES ('delete', old.id, old.englishName, old.spanishName, old.tamilWord);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS originalWords_search_update
+    AFTER UPDATE OF englishName, spanishName, tamilWord ON originalWords BEGIN
+        INSERT INTO wordSearch(wordSearch, rowid, englishName, spanishName, tamilWord)
+        VALUES ('delete', old.id, old.englishName, old.spanishName, old.tamilWord);
+        INSERT INTO wordSearch(rowid, englishName, spanishName, tamilWord)
+        VALUES (new.id, new.englishName, new.spanishName, new.tamilWord);
+    END
+    """,
+]
+
+
+def init_word_search(engine: Engine):
+    """Create the FTS5 index and its sync triggers, populating the index when new"""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SEARCH_TABLE}
+        ).first()
+        if not exists:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE wordSearch USING fts5("
+                "englishName, spanishName, tamilWord, "
+                "content='originalWords', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            ))
+            conn.execute(text("INSERT INTO wordSearch(wordSearch) VALUES ('rebuild')"))
+        for statement in _SEARCH_DDL:
+            conn.execute(text(statement))
+
+
+def build_match_query(query: str, languages: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query where every term is a prefix match.
+
+    Returns:
+        The MATCH expression, or None if the text has no searchable terms
+    """
+    terms = [term.replace('"', "") for term in query.split()]
+    terms = [f'"{term}"*' for term in terms if term]
+    if not terms:
+        return None
+    expression = " ".join(terms)
+    if languages:
+        columns = " ".join(SEARCH_COLUMNS[language] for language in sorted(languages))
+        expression = f"{{{columns}}} : ({expression})"
+    return expression
+
+
+async def search_word_ids(
+    db: AsyncSession,
+    query: str,
+    languages: Optional[Iterable[str]] = None,
+    limit: int = 20
+) -> List[int]:
+    """Get the ids of words matching the query, best match first"""
+    if db.bind.dialect.name != "sqlite":
+        return await _search_word_ids_by_prefix(db, query, languages, limit)
+    
+    expression = build_match_query(query, languages)
+    if expression is None:
+        return []
+    # Soft-deleted words stay in the index, so they are filtered out before the
+    # LIMIT; otherwise a page could come back short while live matches remain
+    rows = await db.execute(
+        text(
+            "SELECT wordSearch.rowid FROM wordSearch "
+            "JOIN originalWords ON originalWords.id = wordSearch.rowid "
+            "WHERE wordSearch MATCH :query AND originalWords.deletedAt IS NULL "
+            "ORDER BY wordSearch.rank LIMIT :limit"
+        ),
+        {"query": expression, "limit": limit}
+    )
+    return [row[0] for row in rows]
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _search_word_ids_by_prefix(
+    db: AsyncSession,
+    query: str,
+    languages: Optional[Iterable[str]],
+    limit: int
+) -> List[int]:
+    """Fallback search: every term must prefix a word in one of the searched names"""
+    terms = [_escape_like(term) for term in query.split()]
+    if not terms:
+        return []
+    columns = [getattr(OriginalWord, SEARCH_COLUMNS[language]) for language in sorted(languages or SEARCH_COLUMNS)]
+    conditions = [
+        or_(*(
+            condition
+            for column in columns
+            for condition in (column.ilike(f"{term}%", escape="\\"), column.ilike(f"% {term}%", escape="\\"))
+        ))
+        for term in terms
+    ]
+    rows = await db.execute(
+        select(OriginalWord.id)
+        .where(OriginalWord.deletedAt.is_(None), *conditions)
+        .order_by(OriginalWord.englishName, OriginalWord.id)
+        .limit(limit)
+    )
+    return [row[0] for row in rows]
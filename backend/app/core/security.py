@@ -1,12 +1,22 @@
 """
 Security utilities: Password hashing and JWT token management
 """
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
-from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
+    PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE, PASSWORD_HASH_RETRY_AFTER_SECONDS
+)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -21,6 +31,142 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_password_hashes(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords in one worker call"""
+    return [pwd_context.hash(password) for password in passwords]
+
+
+class PasswordHasher:
+    """
+    Dedicated, size-bounded process pool for bcrypt work.
+
+    Hashing is CPU-bound, so running it on the request threadpool lets a login
+    rush starve every other endpoint. Here at most `workers` hashes run at once
+    and `queue_size` more may wait; beyond that callers get 503 with Retry-After.
+    """
+    
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+    
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a pool whose worker died, so the next call starts a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+        )
+    
+    def _acquire(self) -> bool:
+        """Reserve a slot in the pool, or report that it is full"""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                return False
+            self._in_flight += 1
+            return True
+    
+    async def _run(self, function, *args):
+        """
+        Run a call in the pool.
+        
+        A worker that crashed or was OOM-killed breaks the whole pool, so the
+        broken pool is replaced and the call retried once before giving up with 503.
+        """
+        if not self._acquire():
+            raise self._busy()
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            for _ in range(2):
+                executor = self._get_executor()
+                try:
+                    result = await asyncio.wrap_future(executor.submit(function, *args))
+                except BrokenProcessPool:
+                    self._discard_executor(executor)
+                    continue
+                succeeded = True
+                return result
+            raise self._busy()
+        finally:
+            # Only successful calls count towards throughput and latency
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                if succeeded:
+                    self._completed += 1
+                    self._total_seconds += elapsed
+                    self._max_seconds = max(self._max_seconds, elapsed)
+                else:
+                    self._failed += 1
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password in the pool"""
+        return await self._run(get_password_hash, password)
+    
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch of passwords split into one chunk per worker, so every core is used"""
+        if not passwords:
+            return []
+        size = -(-len(passwords) // self.workers)
+        chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+        results = await asyncio.gather(*(self._run(get_password_hashes, chunk) for chunk in chunks))
+        return [hashed for chunk in results for hashed in chunk]
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash in the pool"""
+        return await self._run(verify_password, plain_password, hashed_password)
+    
+    def stats(self) -> dict:
+        """Queue depth and latency metrics (latency of successful calls, including time spent queued)"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "inFlight": self._in_flight,
+                "queueDepth": max(0, self._in_flight - self.workers),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "averageLatencyMs": (self._total_seconds / self._completed * 1000) if self._completed else 0.0,
+                "maxLatencyMs": self._max_seconds * 1000,
+            }
+    
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -0,0 +1,154 @@
+"""
+Write-behind Buffer for Attempt Logging
+
+Quiz and pronunciation attempts are append-only telemetry that clients never
+read back immediately, so they need not pay a commit each. When enabled, the
+routes queue the rows here and a background task inserts them in batches,
+one executemany per table and one commit per batch.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import insert
+
+from app.config import WRITE_BEHIND_QUEUE_SIZE, WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_FLUSH_INTERVAL_MS
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Queued after every row by stop(), so the flush task drains the queue and exits
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    """
+    Bounded in-process queue of rows flushed by a background task.
+
+    A batch is written once batch_size rows are waiting or flush_interval
+    seconds after its first row arrived, whichever comes first. When the queue
+    is full, or the buffer is not running, offer() returns False and the caller
+    writes synchronously instead. Rows still queued when the process is killed
+    without a clean shutdown are lost.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._accepting = False
+        self._flushes = 0
+        self._flushed_rows = 0
+        self._failed_rows = 0
+        self._fallbacks = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(self):
+        """Start the flush task on the running event loop"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._accepting = True
+
+    async def stop(self):
+        """Stop accepting rows and wait until every queued row is written"""
+        if self._task is None:
+            return
+        self._accepting = False
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    def offer(self, model, row: dict) -> bool:
+        """Queue a row for insertion into the model's table, or return False to write it now"""
+        if not self._accepting:
+            return False
+        try:
+            self._queue.put_nowait((model, row))
+            return True
+        except asyncio.QueueFull:
+            self._fallbacks += 1
+            return False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    # Take whatever is already queued without waiting
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list):
+        """Insert a batch with one executemany per table in a single transaction"""
+        rows_by_model = defaultdict(list)
+        for model, row in batch:
+            rows_by_model[model].append(row)
+
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                for model, rows in rows_by_model.items():
+                    await db.execute(insert(model), rows)
+                await db.commit()
+        except Exception:
+            self._failed_rows += len(batch)
+            logger.exception("Write-behind flush of %d rows failed; the rows were dropped", len(batch))
+            return
+        elapsed = time.perf_counter() - started
+        self._flushes += 1
+        self._flushed_rows += len(batch)
+        self._total_seconds += elapsed
+        self._max_seconds = max(self._max_seconds, elapsed)
+
+    def stats(self) -> dict:
+        """Queue depth, throughput and flush latency metrics"""
+        return {
+            "enabled": self._accepting,
+            "capacity": self.max_size,
+            "queueDepth": self._queue.qsize() if self._queue is not None else 0,
+            "batchSize": self.batch_size,
+            "flushIntervalMs": self.flush_interval * 1000,
+            "flushes": self._flushes,
+            "flushedRows": self._flushed_rows,
+            "failedRows": self._failed_rows,
+            "synchronousFallbacks": self._fallbacks,
+            "averageFlushMs": (self._total_seconds / self._flushes * 1000) if self._flushes else 0.0,
+            "maxFlushMs": self._max_seconds * 1000,
+        }
+
+
+attempt_buffer = WriteBehindBuffer(
+    WRITE_BEHIND_QUEUE_SIZE,
+    WRITE_BEHIND_BATCH_SIZE,
+    WRITE_BEHIND_FLUSH_INTERVAL_MS / 1000
+)
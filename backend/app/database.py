@@ -1,24 +1,230 @@
 """
 Database Configuration and Session Management
 """
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event, inspect, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from app.config import DATABASE_URL
-
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+from app.config import (
+    DATABASE_URL, ARCHIVE_DATABASE_PATH, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_CACHE_SIZE,
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE, SQLITE_TEMP_STORE
 )
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection.
+
+    WAL lets readers proceed while a writer commits, and synchronous=NORMAL is
+    durable in WAL mode except for the last commits before a power loss.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA temp_store={SQLITE_TEMP_STORE}")
+    cursor.close()
+
+
+# Async driver used by the API for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def _engine_options(database_url: URL) -> dict:
+    """Pool sizing and connect arguments shared by the sync and async engines"""
+    if database_url.get_backend_name() != "sqlite":
+        # Server databases drop idle connections, so check them on checkout and recycle old ones
+        options = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING
+        }
+        if database_url.get_driver_name() == "asyncpg":
+            # Hot queries are prepared once per connection and then executed by name
+            options["connect_args"] = {"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE}
+        return options
+    if database_url.database in (None, "", ":memory:"):
+        # In-memory databases live in a single connection; pool sizing does not apply
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "connect_args": {"check_same_thread": False},
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT
+    }
+
+
+def _is_sqlite_file(database_url: URL) -> bool:
+    """Check whether the URL points at an SQLite database file, which gets the pragmas"""
+    return database_url.get_backend_name() == "sqlite" and database_url.database not in (None, "", ":memory:")
+
+
+# Schema holding archived attempt history (an attached database on SQLite)
+ARCHIVE_SCHEMA = "archive"
+
+
+def _archive_database_path(database_url: URL) -> str:
+    """Get the SQLite file attached as the archive schema, next to the main file by default"""
+    if not _is_sqlite_file(database_url):
+        return ":memory:"
+    if ARCHIVE_DATABASE_PATH:
+        return ARCHIVE_DATABASE_PATH
+    root, extension = os.path.splitext(database_url.database)
+    return f"{root}-archive{extension or '.db'}"
+
+
+def _attach_archive(database_url: URL, tuned: bool):
+    """Build a connect listener attaching the archive database to every SQLite connection"""
+    archive_path = _archive_database_path(database_url)
+    tune = tuned and _is_sqlite_file(database_url)
+
+    def attach(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (archive_path,))
+        if tune:
+            cursor.execute(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode={SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA {ARCHIVE_SCHEMA}.synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.close()
+
+    return attach
+
+
+def create_db_engine(url: str = DATABASE_URL, tuned: bool = True) -> Engine:
+    """
+    Create a sync engine with the configured pool sizing.
+
+    File-backed SQLite databases also get the connection pragmas unless tuned
+    is False (used by the benchmark to measure the untuned baseline).
+    """
+    database_url = make_url(url)
+    engine = create_engine(url, **_engine_options(database_url))
+    if tuned and _is_sqlite_file(database_url):
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    if database_url.get_backend_name() == "sqlite":
+        event.listen(engine, "connect", _attach_archive(database_url, tuned))
+    return engine
+
+
+def create_async_db_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    """
+    Create the async engine used by the API routes.
+
+    The URL's default driver is swapped for its async counterpart (aiosqlite,
+    asyncpg), so DATABASE_URL stays a plain sqlite:// or postgresql:// URL.
+    """
+    database_url = make_url(url)
+    backend = database_url.get_backend_name()
+    if backend in ASYNC_DRIVERS and database_url.get_driver_name() != ASYNC_DRIVERS[backend]:
+        database_url = database_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    
+    options = _engine_options(database_url)
+    if _is_sqlite_file(database_url):
+        # aiosqlite defaults to opening a connection per checkout; pool them like the sync engine
+        options["poolclass"] = AsyncAdaptedQueuePool
+    async_engine = create_async_engine(database_url, **options)
+    if _is_sqlite_file(database_url):
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if backend == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _attach_archive(database_url, True))
+    return async_engine
+
+
+# Sync engine for schema setup and scripts; the API uses the async engine
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine()
+# Objects stay loaded after commit: async sessions cannot lazily refresh expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+def dialect_insert(bind):
+    """Get the insert() of the bind's dialect, which supports ON CONFLICT clauses"""
+    return postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+
+
+def _add_missing_columns():
+    """Add columns introduced after a table was first created (new columns only, never drops)"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name, schema=table.schema)}
+            qualified_name = f'{table.schema}."{table.name}"' if table.schema else f'"{table.name}"'
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f'ALTER TABLE {qualified_name} ADD COLUMN "{column.name}" {column.type.compile(engine.dialect)}'
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                    if not column.nullable:
+                        ddl += " NOT NULL"
+                conn.execute(text(ddl))
+
+
+def _backfill_rollups():
+    """
+    Fill empty analytics rollup tables from the raw rows.
+
+    Databases that predate the rollups have history but no rollup rows, and the
+    analytics overview would show zeros for every learner until they are built.
+    """
+    # Imported here: the models and rollup queries import this module
+    from app.core.rollups import module_totals, session_totals
+    from app.models import ModuleRollup, SessionRollup
+
+    with engine.begin() as conn:
+        for model, totals in ((ModuleRollup, module_totals), (SessionRollup, session_totals)):
+            if conn.scalar(select(model.userId).limit(1)) is not None:
+                continue
+            rows = totals()
+            # Workers starting together may all find the table empty; the first
+            # insert wins and the others skip every row instead of failing
+            conn.execute(
+                dialect_insert(conn)(model)
+                .from_select(list(rows.selected_columns.keys()), rows)
+                .on_conflict_do_nothing()
+            )
+
+
+def init_db():
+    """
+    Create missing tables, columns and indexes.
+
+    create_all only builds tables that do not exist yet, so columns and indexes
+    added to existing models are created separately for databases that already exist.
+    On PostgreSQL the archive schema is created first. Empty analytics rollup
+    tables are then built from the existing history.
+    """
+    if engine.dialect.name == "postgresql":
+        # SQLite attaches the archive database on connect instead
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    _backfill_rollups()
+
+
+async def get_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,48 +1,173 @@
 """
 Shared Dependencies for API Routes
 """
+import asyncio
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import (
+    AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS,
+    AUTH_STATELESS, AUTH_REVOCATION_REFRESH_SECONDS
+)
 from app.database import get_db
 from app.models import User
+from app.core.cache import TTLCache
 from app.core.security import decode_token
 
 security = HTTPBearer()
 
 
-def get_current_user(
+class Principal:
+    """Lightweight identity of an authenticated user, without the full users row"""
+    
+    __slots__ = ("userId", "username", "tokenVersion")
+    
+    def __init__(self, userId: int, username: str, tokenVersion: int = 0):
+        self.userId = userId
+        self.username = username
+        self.tokenVersion = tokenVersion  # Version the token was issued with
+
+
+class TokenRevocations:
+    """
+    Compact in-memory copy of users.tokenVersion for stateless token checks.
+    
+    Only users that ever revoked their tokens (tokenVersion > 0) are kept. The
+    copy is reloaded at most every refresh_seconds, so a revocation made by
+    another worker takes effect within that interval.
+    """
+    
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._versions = {}
+        self._loaded_at = None
+        self._lock = asyncio.Lock()
+    
+    async def refresh_if_stale(self, db: AsyncSession):
+        """Reload revoked token versions if the copy is older than the refresh interval"""
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self._loaded_at is not None and now - self._loaded_at < self.refresh_seconds:
+                return
+            rows = await db.execute(select(User.userId, User.tokenVersion).where(User.tokenVersion > 0))
+            # Versions only grow, so keep revocations recorded while the query was running
+            versions = dict(self._versions)
+            for user_id, token_version in rows:
+                versions[user_id] = max(token_version, versions.get(user_id, 0))
+            self._versions = versions
+            self._loaded_at = now
+    
+    def record(self, user_id: int, token_version: int):
+        """Apply a revocation made by this process immediately"""
+        self._versions[user_id] = max(token_version, self._versions.get(user_id, 0))
+    
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        return token_version < self._versions.get(user_id, 0)
+
+
+# Verified token -> Principal, so hot authenticated paths skip the users lookup
+principal_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)
+token_revocations = TokenRevocations(AUTH_REVOCATION_REFRESH_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """Drop cached principals for a user whose row was updated or deleted"""
+    principal_cache.discard_where(lambda principal: principal.userId == user_id)
+
+
+def _unauthorized(detail: str = "Invalid authentication credentials") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def _decode_claims(token: str) -> dict:
+    """
+    Verify a JWT and return its claims with the user id as an int.
+    
+    Raises:
+        HTTPException: If token is invalid
+    """
+    payload = decode_token(token)
+    if payload is None or payload.get("sub") is None:
+        raise _unauthorized()
+    payload["sub"] = int(payload["sub"])
+    return payload
+
+
+async def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     """
-    Get the current authenticated user from JWT token.
+    Get the userId and username of the authenticated user.
+    
+    Verified tokens are cached for AUTH_CACHE_TTL_SECONDS (never past the token's
+    expiry), so repeat requests need no signature verification or users lookup.
+    Cache hits are still checked against the revocation copy, so a logout-all
+    or password change handled by another worker takes effect within
+    AUTH_REVOCATION_REFRESH_SECONDS. In AUTH_STATELESS mode the users table is
+    not read at all: the principal comes from the token claims and only the
+    revocation copy is consulted.
     
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid, revoked or user not found
     """
     token = credentials.credentials
-    payload = decode_token(token)
+    principal = principal_cache.get(token)
+    if principal is not None:
+        await token_revocations.refresh_if_stale(db)
+        if token_revocations.is_revoked(principal.userId, principal.tokenVersion):
+            invalidate_user(principal.userId)
+            raise _unauthorized("Token has been revoked")
+        return principal
+    
+    claims = _decode_claims(token)
+    user_id, token_version = claims["sub"], claims.get("ver", 0)
+    
+    if AUTH_STATELESS and claims.get("username") is not None:
+        await token_revocations.refresh_if_stale(db)
+        if token_revocations.is_revoked(user_id, token_version):
+            raise _unauthorized("Token has been revoked")
+        return Principal(user_id, claims["username"], token_version)
     
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
+    row = (await db.execute(
+        select(User.userId, User.username, User.tokenVersion).where(User.userId == user_id)
+    )).first()
+    if row is None:
+        raise _unauthorized("User not found")
+    if token_version < row.tokenVersion:
+        raise _unauthorized("Token has been revoked")
     
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
+    principal = Principal(row.userId, row.username, token_version)
+    if claims.get("exp") is not None:
+        principal_cache.set(token, principal, ttl=claims["exp"] - time.time())
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Get the current authenticated user from JWT token.
+    
+    Loads the full users row; endpoints that only need the user id should
+    depend on get_current_principal instead.
+    
+    Raises:
+        HTTPException: If token is invalid, revoked or user not found
+    """
+    claims = _decode_claims(credentials.credentials)
     
-    user = db.query(User).filter(User.userId == int(user_id)).first()
+    user = await db.scalar(select(User).where(User.userId == claims["sub"]))
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+        raise _unauthorized("User not found")
+    if claims.get("ver", 0) < user.tokenVersion:
+        raise _unauthorized("Token has been revoked")
     
     return user
@@ -1,27 +1,53 @@
 """
 MiABC API - Main Application Entry Point
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config import CORS_ORIGINS
-from app.database import engine
+from app.config import (
+    CORS_ORIGINS, AUTO_CREATE_SCHEMA, WRITE_BEHIND_ENABLED,
+    QUERY_INSTRUMENTATION, QUERY_STRICT_MODE, QUERY_REPEAT_THRESHOLD
+)
 from app.models import User, FamilyMember, OriginalWord, ReadingText, LearnerProgress, QuizAttempt, PronunciationAttempt, LearningSession
-from app.database import Base
-from app.core.firebase import init_firebase
-from app.routers import auth, users, family, words, reading, uploads, progress, analytics
+from app.models import ModuleRollup, SessionRollup, ArchivedQuizAttempt, ArchivedPronunciationAttempt, AttemptDailyRollup
+from app.database import engine, async_engine, init_db
+from app.core.search import init_word_search
+from app.core.firebase import is_firebase_available
+from app.core.security import password_hasher
+from app.core.write_behind import attempt_buffer
+from app.core.instrumentation import QueryInstrumentationMiddleware, install_query_listeners
+from app.routers import auth, users, family, words, reading, uploads, progress, analytics, export, metrics
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
-# Initialize Firebase
-firebase_bucket = init_firebase()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Prepare the database when the server starts and release pools when it stops.
+    
+    Nothing runs at import time; Firebase is initialized on first storage use.
+    """
+    if AUTO_CREATE_SCHEMA:
+        # Create database tables, indexes and the word search index
+        init_db()
+        init_word_search(engine)
+    if WRITE_BEHIND_ENABLED:
+        attempt_buffer.start()
+    yield
+    # Write out queued attempts while the database is still reachable
+    await attempt_buffer.stop()
+    # Close pooled async connections so their driver threads can exit
+    await async_engine.dispose()
+    password_hasher.shutdown()
+
 
 # Create FastAPI application
 app = FastAPI(
     title="MiABC API",
     version="1.0.0",
-    description="Backend API for the MiABC educational app with Tamil language support"
+    description="Backend API for the MiABC educational app with Tamil language support",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -31,8 +57,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Media-Base-Url", "Server-Timing", "Content-Disposition"],
 )
 
+# Query count and database time of every request
+if QUERY_INSTRUMENTATION:
+    install_query_listeners(async_engine.sync_engine)
+    app.add_middleware(
+        QueryInstrumentationMiddleware,
+        strict=QUERY_STRICT_MODE,
+        repeat_threshold=QUERY_REPEAT_THRESHOLD
+    )
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -42,6 +78,8 @@ app.include_router(reading.router)
 app.include_router(uploads.router)
 app.include_router(progress.router)
 app.include_router(analytics.router)
+app.include_router(export.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -50,7 +88,7 @@ def root():
     return {
         "message": "MiABC API is running",
         "version": "1.0.0",
-        "firebase": firebase_bucket is not None
+        "firebase": is_firebase_available()
     }
 
 
@@ -1,4 +1,8 @@
 # Models package
 from app.models.user import User, FamilyMember
-from app.models.word import OriginalWord, ReadingText
-from app.models.progress import LearnerProgress, QuizAttempt, PronunciationAttempt, LearningSession
+from app.models.word import OriginalWord, CatalogVersion, ReadingText
+from app.models.progress import (
+    LearnerProgress, QuizAttempt, PronunciationAttempt, LearningSession,
+    ModuleRollup, SessionRollup
+)
+from app.models.archive import ArchivedQuizAttempt, ArchivedPronunciationAttempt, AttemptDailyRollup
@@ -0,0 +1,73 @@
+"""
+Archived Attempt and Rollup Models
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, Index
+
+from app.database import Base, ARCHIVE_SCHEMA
+
+
+class ArchivedQuizAttempt(Base):
+    """Quiz attempts older than the archive horizon, moved out of quizAttempts with their ids"""
+    __tablename__ = "quizAttempts"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    userId = Column(Integer, nullable=False)  # No foreign key: the archive may be another database
+    quizType = Column(String(50), nullable=False)
+    questionId = Column(Integer)
+    userAnswer = Column(String(255))
+    correctAnswer = Column(String(255))
+    isCorrect = Column(Integer)
+    responseTime = Column(Integer)
+    language = Column(String(20))
+    createdAt = Column(DateTime)
+    clientEventId = Column(String(36))
+
+    __table_args__ = (
+        # Continuation of GET /api/quiz/attempts past the newest archived attempt
+        Index("ix_archive_quizAttempts_userId_createdAt", "userId", "createdAt", "id"),
+        Index("ix_archive_quizAttempts_userId_quizType_createdAt", "userId", "quizType", "createdAt", "id"),
+        # Journal sync skips replayed entries whose original was archived
+        Index("ix_archive_quizAttempts_userId_clientEventId", "userId", "clientEventId"),
+        {"schema": ARCHIVE_SCHEMA},
+    )
+
+
+class ArchivedPronunciationAttempt(Base):
+    """Pronunciation attempts older than the archive horizon, moved out of pronunciationAttempts"""
+    __tablename__ = "pronunciationAttempts"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    userId = Column(Integer, nullable=False)
+    wordId = Column(Integer)
+    targetWord = Column(String(100), nullable=False)
+    userPronunciation = Column(Text)
+    accuracyScore = Column(Integer)
+    language = Column(String(20))
+    createdAt = Column(DateTime)
+    clientEventId = Column(String(36))
+
+    __table_args__ = (
+        Index("ix_archive_pronunciationAttempts_userId_createdAt", "userId", "createdAt", "id"),
+        Index("ix_archive_pronunciationAttempts_userId_clientEventId", "userId", "clientEventId"),
+        {"schema": ARCHIVE_SCHEMA},
+    )
+
+
+class AttemptDailyRollup(Base):
+    """Per-learner daily totals of archived attempts, kept in the main database"""
+    __tablename__ = "attemptDailyRollups"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    userId = Column(Integer, nullable=False)
+    day = Column(Date, nullable=False)
+    attemptType = Column(String(20), nullable=False)  # quiz or pronunciation
+    category = Column(String(100), nullable=False, default="")  # quizType for quiz attempts
+    attempts = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)  # Quiz attempts with isCorrect set
+    scoreSum = Column(Integer, nullable=False, default=0)  # Sum of pronunciation accuracy scores
+    scoredAttempts = Column(Integer, nullable=False, default=0)  # Attempts that had a score
+
+    __table_args__ = (
+        # One row per learner, day and category; the archive job adds to it with an upsert
+        Index("ix_attemptDailyRollups_userId_day_type_category", "userId", "day", "attemptType", "category", unique=True),
+    )
@@ -1,7 +1,7 @@
 """
 Learner Progress and Analytics Models
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from datetime import datetime
 
 from app.database import Base
@@ -13,7 +13,7 @@ class LearnerProgress(Base):
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     userId = Column(Integer, ForeignKey("users.userId"), nullable=False)
-    moduleName = Column(String(50), nullable=False, index=True)  # Alphabet, Reading, Writing, Games, etc.
+    moduleName = Column(String(50), nullable=False)  # Alphabet, Reading, Writing, Games, etc.
     moduleType = Column(String(50))  # Sound, Word, Quiz, etc.
     itemId = Column(Integer)  # Reference to word, quiz, etc.
     score = Column(Integer)  # Performance score (0-100)
@@ -23,6 +23,16 @@ class LearnerProgress(Base):
     language = Column(String(20), default="english")
     createdAt = Column(DateTime, default=datetime.utcnow)
     updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    clientEventId = Column(String(36))  # UUID of the offline journal entry, if synced
+    
+    __table_args__ = (
+        # Keyset pagination of GET /api/progress, with and without a module filter; the
+        # (userId, moduleName) prefix also serves the per-module analytics grouping
+        Index("ix_learnerProgress_userId_createdAt", "userId", "createdAt", "id"),
+        Index("ix_learnerProgress_userId_moduleName_createdAt", "userId", "moduleName", "createdAt", "id"),
+        # Deduplicates journal entries replayed by POST /api/sync/journal (NULLs never conflict)
+        Index("ix_learnerProgress_userId_clientEventId", "userId", "clientEventId", unique=True),
+    )
 
 
 class QuizAttempt(Base):
@@ -39,6 +49,15 @@ class QuizAttempt(Base):
     responseTime = Column(Integer)  # Time in milliseconds
     language = Column(String(20), default="english")
     createdAt = Column(DateTime, default=datetime.utcnow)
+    clientEventId = Column(String(36))  # UUID of the offline journal entry, if synced
+    
+    __table_args__ = (
+        # Keyset pagination of GET /api/quiz/attempts, with and without a quiz type filter
+        Index("ix_quizAttempts_userId_createdAt", "userId", "createdAt", "id"),
+        Index("ix_quizAttempts_userId_quizType_createdAt", "userId", "quizType", "createdAt", "id"),
+        # Journal deduplication, as on learnerProgress
+        Index("ix_quizAttempts_userId_clientEventId", "userId", "clientEventId", unique=True),
+    )
 
 
 class PronunciationAttempt(Base):
@@ -53,6 +72,14 @@ class PronunciationAttempt(Base):
     accuracyScore = Column(Integer)  # 0-100
     language = Column(String(20), default="english")
     createdAt = Column(DateTime, default=datetime.utcnow)
+    clientEventId = Column(String(36))  # UUID of the offline journal entry, if synced
+    
+    __table_args__ = (
+        # Per-learner pronunciation history in creation order
+        Index("ix_pronunciationAttempts_userId_createdAt", "userId", "createdAt", "id"),
+        # Journal deduplication, as on learnerProgress
+        Index("ix_pronunciationAttempts_userId_clientEventId", "userId", "clientEventId", unique=True),
+    )
 
 
 class LearningSession(Base):
@@ -68,3 +95,32 @@ class LearningSession(Base):
     itemsCompleted = Column(Integer, default=0)
     averageScore = Column(Integer)
     createdAt = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Session totals of the analytics overview and per-learner session history
+        Index("ix_learningSessions_userId_createdAt", "userId", "createdAt", "id"),
+    )
+
+
+class ModuleRollup(Base):
+    """Running per-module totals of a learner's progress rows, kept in step by every progress write"""
+    __tablename__ = "moduleRollups"
+    
+    userId = Column(Integer, ForeignKey("users.userId"), primary_key=True)
+    moduleName = Column(String(50), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)  # Progress rows
+    scoredAttempts = Column(Integer, nullable=False, default=0)  # Rows with a score
+    scoreSum = Column(Integer, nullable=False, default=0)
+    completedCount = Column(Integer, nullable=False, default=0)
+    timeSpent = Column(Integer, nullable=False, default=0)  # Seconds
+    lastActivityAt = Column(DateTime)
+
+
+class SessionRollup(Base):
+    """Running totals of a learner's learning sessions"""
+    __tablename__ = "sessionRollups"
+    
+    userId = Column(Integer, ForeignKey("users.userId"), primary_key=True)
+    sessions = Column(Integer, nullable=False, default=0)
+    totalTimeSpent = Column(Integer, nullable=False, default=0)  # Seconds
+    lastSessionAt = Column(DateTime)
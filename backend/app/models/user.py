@@ -24,6 +24,7 @@ class User(Base):
     password = Column(String(255), nullable=False)
     parentalLock = Column(String(10))
     profilePhoto = Column(Text)
+    tokenVersion = Column(Integer, nullable=False, default=0, server_default="0", index=True)  # Tokens issued with a lower version are revoked
     createdAt = Column(DateTime, default=datetime.utcnow)
     
     family_members = relationship("FamilyMember", back_populates="user", cascade="all, delete-orphan")
@@ -33,7 +34,7 @@ class FamilyMember(Base):
     __tablename__ = "familyMembers"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    userId = Column(Integer, ForeignKey("users.userId"), nullable=False)
+    userId = Column(Integer, ForeignKey("users.userId"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     relation = Column(String(50), nullable=False)
     photoUri = Column(Text)
@@ -26,13 +26,24 @@ class OriginalWord(Base):
     letra = Column(String(10))
     dateCompleted = Column(DateTime)
     createdAt = Column(DateTime, default=datetime.utcnow)
+    updatedAt = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deletedAt = Column(DateTime)  # Set instead of deleting so clients can sync the removal
+    version = Column(Integer, nullable=False, default=0, server_default="0", index=True)  # Catalog version of the last change
+
+
+class CatalogVersion(Base):
+    """Single-row counter for the word catalog version, bumped by every word write"""
+    __tablename__ = "catalogVersion"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
 
 
 class ReadingText(Base):
     __tablename__ = "readingTexts"
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    userId = Column(Integer, ForeignKey("users.userId"), nullable=False)
+    userId = Column(Integer, ForeignKey("users.userId"), nullable=False, index=True)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     language = Column(String(20), default="english")
@@ -1,2 +1,2 @@
 # Routers package
-from app.routers import auth, users, family, words, reading, uploads, progress, analytics
+from app.routers import auth, users, family, words, reading, uploads, progress, analytics, export, metrics
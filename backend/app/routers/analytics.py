@@ -1,54 +1,52 @@
 """
 Analytics Routes
 """
+from datetime import date, datetime, time
+from typing import List, Literal, Optional
+
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Date, case, func, literal, select
 
 from app.database import get_db
-from app.models import User, LearnerProgress, LearningSession
-from app.schemas import LearnerAnalytics, ModuleStats
-from app.dependencies import get_current_user
+from app.models import (
+    LearnerProgress, ModuleRollup, SessionRollup,
+    QuizAttempt, PronunciationAttempt, AttemptDailyRollup
+)
+from app.schemas import LearnerAnalytics, ModuleStats, AttemptDailyStats
+from app.dependencies import Principal, get_current_principal
 
 router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
 
 
 @router.get("/overview", response_model=LearnerAnalytics)
-def get_learner_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_learner_analytics(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Get comprehensive learner analytics"""
-    # Total sessions
-    total_sessions = db.query(func.count(LearningSession.id)).filter(
-        LearningSession.userId == current_user.userId
-    ).scalar() or 0
+    """
+    Get comprehensive learner analytics.
     
-    # Total time spent
-    total_time = db.query(func.sum(LearningSession.totalTimeSpent)).filter(
-        LearningSession.userId == current_user.userId
-    ).scalar() or 0
+    Totals come from the learner's rollup rows, one per module plus one for
+    sessions, which the progress and session routes keep up to date.
+    """
+    session_rollup = await db.get(SessionRollup, current_user.userId)
+    total_sessions = session_rollup.sessions if session_rollup else 0
+    total_time = session_rollup.totalTimeSpent if session_rollup else 0
     
-    # Average score from progress
-    avg_score = db.query(func.avg(LearnerProgress.score)).filter(
-        LearnerProgress.userId == current_user.userId,
-        LearnerProgress.score.isnot(None)
-    ).scalar() or 0.0
+    module_rollups = (await db.scalars(
+        select(ModuleRollup).where(ModuleRollup.userId == current_user.userId)
+    )).all()
     
-    # Module progress
-    modules_progress = {}
-    progress_by_module = db.query(
-        LearnerProgress.moduleName,
-        func.avg(LearnerProgress.score),
-        func.count(LearnerProgress.id)
-    ).filter(
-        LearnerProgress.userId == current_user.userId
-    ).group_by(LearnerProgress.moduleName).all()
+    # Average over scored progress rows, overall and per module
+    scored_attempts = sum(rollup.scoredAttempts for rollup in module_rollups)
+    avg_score = sum(rollup.scoreSum for rollup in module_rollups) / scored_attempts if scored_attempts else 0.0
     
-    for module_name, avg_module_score, count in progress_by_module:
-        modules_progress[module_name] = {
-            "averageScore": float(avg_module_score) if avg_module_score else 0,
-            "attempts": count
+    modules_progress = {}
+    for rollup in module_rollups:
+        modules_progress[rollup.moduleName] = {
+            "averageScore": rollup.scoreSum / rollup.scoredAttempts if rollup.scoredAttempts else 0,
+            "attempts": rollup.attempts
         }
     
     # Strong and weak areas
@@ -56,9 +54,11 @@ def get_learner_analytics(
     weak_areas = [m for m, data in modules_progress.items() if data["averageScore"] < 50 and data["attempts"] > 0]
     
     # Recent activity
-    recent_progress = db.query(LearnerProgress).filter(
-        LearnerProgress.userId == current_user.userId
-    ).order_by(LearnerProgress.createdAt.desc()).limit(10).all()
+    recent_progress = (await db.scalars(
+        select(LearnerProgress).where(
+            LearnerProgress.userId == current_user.userId
+        ).order_by(LearnerProgress.createdAt.desc()).limit(10)
+    )).all()
     
     recent_activity = [{
         "module": p.moduleName,
@@ -77,19 +77,71 @@ def get_learner_analytics(
     }
 
 
+async def _module_stats(
+    db: AsyncSession,
+    user_id: int,
+    module_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    language: Optional[str] = None
+) -> List[dict]:
+    """
+    Aggregate a learner's progress per module in a single grouped query.
+    
+    The average score is the score sum over all attempts, unscored ones
+    included, as the module statistics have always reported it.
+    """
+    statement = select(
+        LearnerProgress.moduleName,
+        func.count(LearnerProgress.id),
+        func.coalesce(func.sum(case((LearnerProgress.completed == 1, 1), else_=0)), 0),
+        func.coalesce(func.sum(LearnerProgress.score), 0),
+        func.coalesce(func.sum(LearnerProgress.timeSpent), 0)
+    ).where(
+        LearnerProgress.userId == user_id
+    ).group_by(LearnerProgress.moduleName).order_by(LearnerProgress.moduleName)
+    if module_name is not None:
+        statement = statement.where(LearnerProgress.moduleName == module_name)
+    if since is not None:
+        statement = statement.where(LearnerProgress.createdAt >= since)
+    if until is not None:
+        statement = statement.where(LearnerProgress.createdAt < until)
+    if language is not None:
+        statement = statement.where(LearnerProgress.language == language)
+    
+    return [{
+        "moduleName": name,
+        "completionRate": completed / total_attempts * 100,
+        "averageScore": score_sum / total_attempts,
+        "totalAttempts": total_attempts,
+        "timeSpent": time_spent
+    } for name, total_attempts, completed, score_sum, time_spent in (await db.execute(statement)).all()]
+
+
+@router.get("/modules", response_model=List[ModuleStats])
+async def get_all_module_stats(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    language: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Get statistics for every module the learner has progress in, optionally within [since, until) and one language"""
+    return await _module_stats(db, current_user.userId, since=since, until=until, language=language)
+
+
 @router.get("/module/{module_name}", response_model=ModuleStats)
-def get_module_stats(
+async def get_module_stats(
     module_name: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    language: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get detailed statistics for a specific module"""
-    progress = db.query(LearnerProgress).filter(
-        LearnerProgress.userId == current_user.userId,
-        LearnerProgress.moduleName == module_name
-    ).all()
-    
-    if not progress:
+    stats = await _module_stats(db, current_user.userId, module_name, since, until, language)
+    if not stats:
         return {
             "moduleName": module_name,
             "completionRate": 0.0,
@@ -97,16 +149,76 @@ def get_module_stats(
             "totalAttempts": 0,
             "timeSpent": 0
         }
+    return stats[0]
+
+
+def _live_daily_attempts(model, user_id: int, since: Optional[date], until: Optional[date]):
+    """Select per-day totals of attempts still in a live table, in attemptDailyRollups columns"""
+    day = func.date(model.createdAt, type_=Date)
+    if model is QuizAttempt:
+        category, groups = model.quizType, (day, model.quizType)
+        correct = func.coalesce(func.sum(case((model.isCorrect != 0, 1), else_=0)), 0)
+        score_sum, scored = literal(0), literal(0)
+    else:
+        category, groups = literal(""), (day,)
+        correct = literal(0)
+        score_sum = func.coalesce(func.sum(model.accuracyScore), 0)
+        scored = func.count(model.accuracyScore)
+    statement = select(
+        day, category, func.count(model.id), correct, score_sum, scored
+    ).where(model.userId == user_id).group_by(*groups)
+    if since is not None:
+        statement = statement.where(model.createdAt >= datetime.combine(since, time.min))
+    if until is not None:
+        statement = statement.where(model.createdAt < datetime.combine(until, time.min))
+    return statement
+
+
+@router.get("/attempts/daily", response_model=List[AttemptDailyStats])
+async def get_daily_attempt_stats(
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    attempt_type: Optional[Literal["quiz", "pronunciation"]] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Get per-day quiz and pronunciation totals within [since, until).
     
-    completed = sum(1 for p in progress if p.completed == 1)
-    total_attempts = len(progress)
-    avg_score = sum(p.score for p in progress if p.score) / total_attempts if total_attempts > 0 else 0
-    time_spent = sum(p.timeSpent for p in progress if p.timeSpent) or 0
+    Archived days come from the rollup rows the archive job leaves behind and
+    recent days from the live attempts, so the whole history is covered
+    without reading the archive.
+    """
+    totals = {}
     
-    return {
-        "moduleName": module_name,
-        "completionRate": (completed / total_attempts * 100) if total_attempts > 0 else 0,
-        "averageScore": avg_score,
-        "totalAttempts": total_attempts,
-        "timeSpent": time_spent
-    }
+    def add(day, attempt_type_, category, attempts, correct, score_sum, scored):
+        total = totals.setdefault((day, attempt_type_, category), [0, 0, 0, 0])
+        for index, value in enumerate((attempts, correct, score_sum, scored)):
+            total[index] += value
+    
+    rollups = select(AttemptDailyRollup).where(AttemptDailyRollup.userId == current_user.userId)
+    if since is not None:
+        rollups = rollups.where(AttemptDailyRollup.day >= since)
+    if until is not None:
+        rollups = rollups.where(AttemptDailyRollup.day < until)
+    if attempt_type is not None:
+        rollups = rollups.where(AttemptDailyRollup.attemptType == attempt_type)
+    for rollup in await db.scalars(rollups):
+        add(rollup.day, rollup.attemptType, rollup.category,
+            rollup.attempts, rollup.correct, rollup.scoreSum, rollup.scoredAttempts)
+    
+    for model, name in ((QuizAttempt, "quiz"), (PronunciationAttempt, "pronunciation")):
+        if attempt_type not in (None, name):
+            continue
+        for row in await db.execute(_live_daily_attempts(model, current_user.userId, since, until)):
+            add(row[0], name, *row[1:])
+    
+    return [{
+        "day": day,
+        "attemptType": attempt_type_,
+        "category": category,
+        "attempts": attempts,
+        "correct": correct,
+        "averageScore": score_sum / scored if scored else None
+    } for (day, attempt_type_, category), (attempts, correct, score_sum, scored) in sorted(totals.items())]
+
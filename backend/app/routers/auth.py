@@ -1,43 +1,92 @@
 """
 Authentication Routes: Register, Login, Get Current User
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
 
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import REGISTER_BULK_MAX_ROWS
 from app.database import get_db
 from app.models import User
-from app.schemas import UserCreate, UserLogin, Token, User as UserSchema
-from app.core.security import verify_password, get_password_hash, create_access_token
-from app.dependencies import get_current_user
+from app.schemas import (
+    UserCreate, UserLogin, Token, User as UserSchema,
+    BulkRegistrationRow, BulkRegistrationResult
+)
+from app.core.security import password_hasher, create_access_token
+from app.dependencies import (
+    Principal, get_current_principal, get_current_user, invalidate_user, token_revocations
+)
 
 router = APIRouter(prefix="/api", tags=["Authentication"])
 
 
+def _issue_token(user_id: int, username: str, token_version: int = 0) -> str:
+    """Create an access token carrying the claims needed for stateless verification"""
+    return create_access_token(data={
+        "sub": str(user_id),
+        "username": username,
+        "ver": token_version or 0
+    })
+
+
+async def _read_learners(request: Request) -> list:
+    """
+    Read the learner list from a JSON array or a CSV body with a header row.
+    
+    Raises:
+        HTTPException: If the body cannot be parsed
+    """
+    try:
+        body = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 encoded")
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        reader = csv.DictReader(io.StringIO(body))
+        try:
+            # Blank CSV cells mean "not provided" so optional fields keep their defaults
+            return [{key: value for key, value in row.items() if key and value not in (None, "")} for row in reader]
+        except csv.Error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
+    try:
+        learners = json.loads(body)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or text/csv")
+    if not isinstance(learners, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of learners")
+    return learners
+
+
 @router.post("/register", response_model=Token)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     # Check if username already exists
-    db_user = db.query(User).filter(User.username == user.username).first()
+    db_user = await db.scalar(select(User).where(User.username == user.username))
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
     
     # Check if access code already exists
-    db_access = db.query(User).filter(User.accessCode == user.accessCode).first()
+    db_access = await db.scalar(select(User).where(User.accessCode == user.accessCode))
     if db_access:
         raise HTTPException(status_code=400, detail="Access code already used")
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
     db_user = User(
         **user.model_dump(exclude={'password'}),
         password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Create access token
-    access_token = create_access_token(data={"sub": str(db_user.userId)})
+    access_token = _issue_token(db_user.userId, db_user.username, db_user.tokenVersion)
     
     return {
         "access_token": access_token,
@@ -46,17 +95,101 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     }
 
 
+@router.post("/register/bulk", response_model=BulkRegistrationResult)
+async def bulk_register(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Provision a whole class of learners from a JSON array or a CSV upload.
+    
+    Uniqueness of every username and access code is checked with one query,
+    passwords are hashed in parallel across the hashing pool and all valid
+    learners are inserted in one transaction. Invalid rows are reported and
+    skipped without affecting the rest.
+    """
+    learners = await _read_learners(request)
+    if len(learners) > REGISTER_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {REGISTER_BULK_MAX_ROWS} learners can be registered at once"
+        )
+    
+    results = [BulkRegistrationRow(row=row) for row in range(1, len(learners) + 1)]
+    valid = {}
+    for result, learner in zip(results, learners):
+        try:
+            valid[result.row] = UserCreate.model_validate(learner)
+            result.username = valid[result.row].username
+        except ValidationError as e:
+            error = e.errors()[0]
+            result.error = f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+    
+    # One set-based query for every username and access code in the batch
+    usernames = {user.username for user in valid.values()}
+    access_codes = {user.accessCode for user in valid.values()}
+    taken = (await db.execute(
+        select(User.username, User.accessCode).where(
+            or_(User.username.in_(usernames), User.accessCode.in_(access_codes))
+        )
+    )).all()
+    taken_usernames = {row.username for row in taken}
+    taken_access_codes = {row.accessCode for row in taken}
+    
+    for row, user in list(valid.items()):
+        if user.username in taken_usernames:
+            results[row - 1].error = "Username already registered"
+        elif user.accessCode in taken_access_codes:
+            results[row - 1].error = "Access code already used"
+        else:
+            # Later rows repeating a value claimed earlier in this batch are rejected too
+            taken_usernames.add(user.username)
+            taken_access_codes.add(user.accessCode)
+            continue
+        del valid[row]
+    
+    if valid:
+        hashes = await password_hasher.hash_many([user.password for user in valid.values()])
+        rows = [
+            {**user.model_dump(exclude={"password"}), "password": hashed}
+            for user, hashed in zip(valid.values(), hashes)
+        ]
+        try:
+            user_ids = (await db.scalars(
+                insert(User).returning(User.userId, sort_by_parameter_order=True),
+                rows
+            )).all()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail="A username or access code was registered concurrently; retry the batch"
+            )
+        
+        for (row, user), user_id in zip(valid.items(), user_ids):
+            results[row - 1].userId = user_id
+            results[row - 1].access_token = _issue_token(user_id, user.username)
+    
+    return {
+        "created": len(valid),
+        "failed": len(results) - len(valid),
+        "results": results
+    }
+
+
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login and get JWT token"""
-    user = db.query(User).filter(User.username == credentials.username).first()
-    if not user or not verify_password(credentials.password, user.password):
+    user = await db.scalar(select(User).where(User.username == credentials.username))
+    if not user or not await password_hasher.verify(credentials.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
     
-    access_token = create_access_token(data={"sub": str(user.userId)})
+    access_token = _issue_token(user.userId, user.username, user.tokenVersion)
     
     return {
         "access_token": access_token,
@@ -66,6 +199,21 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserSchema)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current authenticated user info"""
     return current_user
+
+
+@router.post("/logout-all")
+async def revoke_all_tokens(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Revoke every token issued to the current user, including this one"""
+    current_user.tokenVersion = User.tokenVersion + 1
+    await db.commit()
+    await db.refresh(current_user)
+    
+    invalidate_user(current_user.userId)
+    token_revocations.record(current_user.userId, current_user.tokenVersion)
+    return {"message": "All sessions have been signed out"}
@@ -0,0 +1,121 @@
+"""
+Data Export Routes
+"""
+import asyncio
+import zlib
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.config import EXPORT_YIELD_PER
+from app.database import AsyncSessionLocal
+from app.models import (
+    LearnerProgress, QuizAttempt, PronunciationAttempt, LearningSession,
+    ArchivedQuizAttempt, ArchivedPronunciationAttempt
+)
+from app.schemas import (
+    LearnerProgress as LearnerProgressSchema,
+    QuizAttempt as QuizAttemptSchema,
+    PronunciationAttempt as PronunciationAttemptSchema,
+    LearningSession as LearningSessionSchema
+)
+from app.dependencies import Principal, get_current_principal
+
+router = APIRouter(prefix="/api/export", tags=["Export"])
+
+# Record type written on each line, with the tables it is read from (archive first) and its schema
+HISTORY_SOURCES = (
+    ("progress", (LearnerProgress,), LearnerProgressSchema),
+    ("quiz", (ArchivedQuizAttempt, QuizAttempt), QuizAttemptSchema),
+    ("pronunciation", (ArchivedPronunciationAttempt, PronunciationAttempt), PronunciationAttemptSchema),
+    ("session", (LearningSession,), LearningSessionSchema),
+)
+
+
+async def _history_lines(user_id: int):
+    """
+    Yield a learner's history as NDJSON, one chunk per EXPORT_YIELD_PER rows.
+    
+    The generator runs after the route has returned, when the request's own
+    session is already closed, so it opens a session of its own. Rows are read
+    as plain table rows (no ORM identity map) through a streaming cursor, which
+    keeps memory flat whatever the size of the history.
+    """
+    db = AsyncSessionLocal()
+    try:
+        for record_type, models, schema in HISTORY_SOURCES:
+            # The record type is spliced in front of the schema's own JSON encoding
+            prefix = b'{"type":"' + record_type.encode() + b'",'
+            for model in models:
+                table = model.__table__
+                statement = select(table).where(table.c.userId == user_id).order_by(
+                    table.c.createdAt, table.c.id
+                ).execution_options(yield_per=EXPORT_YIELD_PER)
+                result = await db.stream(statement)
+                async for rows in result.partitions():
+                    yield b"".join(
+                        prefix + schema.model_validate(row._mapping).model_dump_json().encode()[1:] + b"\n"
+                        for row in rows
+                    )
+    finally:
+        # A client disconnecting mid-download cancels the generator; still hand the connection back
+        await asyncio.shield(db.close())
+
+
+async def _gzip(chunks):
+    """Compress a stream of chunks into a single gzip member"""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows gzip (RFC 9110).
+    
+    An explicit gzip (or its alias x-gzip) entry decides; otherwise "*" does.
+    Codings with q=0, or with a q-value that does not parse, are refused.
+    """
+    weights = {}
+    for element in accept_encoding.lower().split(","):
+        coding, _, parameters = element.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        weight = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value.strip())
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in weights:
+            return weights[coding] > 0
+    return False
+
+
+@router.get("/history")
+async def export_history(
+    request: Request,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Download the learner's full progress, quiz, pronunciation and session history.
+    
+    Each line is a JSON object with a "type" field ("progress", "quiz",
+    "pronunciation" or "session") and the fields of that record, oldest first
+    within each type. The body is gzip-encoded when the client accepts it.
+    """
+    body = _history_lines(current_user.userId)
+    headers = {"Content-Disposition": 'attachment; filename="history.ndjson"', "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        body = _gzip(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
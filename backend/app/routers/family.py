@@ -2,54 +2,57 @@
 Family Member Routes
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.database import get_db
-from app.models import User, FamilyMember
+from app.models import FamilyMember
 from app.schemas import FamilyMemberCreate, FamilyMember as FamilyMemberSchema
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_principal
 
 router = APIRouter(prefix="/api/family-members", tags=["Family Members"])
 
 
 @router.get("", response_model=List[FamilyMemberSchema])
-def get_family_members(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_family_members(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get all family members for current user"""
-    return db.query(FamilyMember).filter(FamilyMember.userId == current_user.userId).all()
+    return (await db.scalars(select(FamilyMember).where(FamilyMember.userId == current_user.userId))).all()
 
 
 @router.post("", response_model=FamilyMemberSchema)
-def create_family_member(
+async def create_family_member(
     member: FamilyMemberCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Create a new family member"""
     db_member = FamilyMember(**member.model_dump(), userId=current_user.userId)
     db.add(db_member)
-    db.commit()
-    db.refresh(db_member)
+    await db.commit()
+    await db.refresh(db_member)
     return db_member
 
 
 @router.delete("/{member_id}")
-def delete_family_member(
+async def delete_family_member(
     member_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Delete a family member"""
-    member = db.query(FamilyMember).filter(
-        FamilyMember.id == member_id,
-        FamilyMember.userId == current_user.userId
-    ).first()
+    member = await db.scalar(
+        select(FamilyMember).where(
+            FamilyMember.id == member_id,
+            FamilyMember.userId == current_user.userId
+        )
+    )
     if not member:
         raise HTTPException(status_code=404, detail="Family member not found")
     
-    db.delete(member)
-    db.commit()
+    await db.delete(member)
+    await db.commit()
     return {"message": "Family member deleted successfully"}
@@ -0,0 +1,19 @@
+"""
+Operational Metrics Routes
+"""
+from fastapi import APIRouter, Depends
+
+from app.core.security import password_hasher
+from app.core.write_behind import attempt_buffer
+from app.dependencies import Principal, get_current_principal
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+
+@router.get("")
+async def get_metrics(current_user: Principal = Depends(get_current_principal)):
+    """Get queue depth and latency metrics of background worker pools (authenticated users only)"""
+    return {
+        "passwordHashing": password_hasher.stats(),
+        "writeBehind": attempt_buffer.stats()
+    }
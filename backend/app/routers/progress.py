@@ -1,122 +1,341 @@
 """
 Progress Tracking Routes
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.database import get_db
-from app.models import User, LearnerProgress, QuizAttempt, PronunciationAttempt, LearningSession
+from app.config import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, EVENTS_BATCH_MAX_ITEMS,
+    SYNC_JOURNAL_MAX_ENTRIES, SYNC_JOURNAL_COMMIT_SIZE
+)
+from app.database import get_db, dialect_insert
+from app.models import (
+    LearnerProgress, QuizAttempt, PronunciationAttempt, LearningSession,
+    ArchivedQuizAttempt, ArchivedPronunciationAttempt
+)
 from app.schemas import (
     LearnerProgressCreate, LearnerProgress as LearnerProgressSchema,
     QuizAttemptCreate, QuizAttempt as QuizAttemptSchema,
     PronunciationAttemptCreate, PronunciationAttempt as PronunciationAttemptSchema,
-    LearningSessionBase, LearningSession as LearningSessionSchema
+    LearningSessionBase, LearningSession as LearningSessionSchema,
+    LearnerEvent, EventBatchResult, JournalEntry, JournalSyncResult, QueuedEvent
 )
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_principal
+from app.core.pagination import NEXT_CURSOR_HEADER, paginate_query, merge_pages
+from app.core.write_behind import attempt_buffer
+from app.core.rollups import add_progress_to_rollups, add_session_to_rollups
 
 router = APIRouter(prefix="/api", tags=["Progress Tracking"])
 
+# Table that stores each type of batched event
+EVENT_MODELS = {
+    "progress": LearnerProgress,
+    "quiz": QuizAttempt,
+    "pronunciation": PronunciationAttempt,
+}
+
+# Archive table that old events of each type are moved to by scripts/archive_attempts.py
+ARCHIVE_MODELS = {
+    "quiz": ArchivedQuizAttempt,
+    "pronunciation": ArchivedPronunciationAttempt,
+}
+
+
+def _queue_attempt(model, values: dict, user_id: int) -> Optional[JSONResponse]:
+    """Hand an attempt to the write-behind buffer, or return None if it must be written now"""
+    created_at = datetime.utcnow()
+    if not attempt_buffer.offer(model, {**values, "userId": user_id, "createdAt": created_at}):
+        return None
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=QueuedEvent(createdAt=created_at).model_dump(mode="json")
+    )
+
 
 @router.post("/progress", response_model=LearnerProgressSchema)
-def track_progress(
+async def track_progress(
     progress: LearnerProgressCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Track learner progress in a module"""
-    db_progress = LearnerProgress(**progress.model_dump(), userId=current_user.userId)
+    values = {**progress.model_dump(), "createdAt": datetime.utcnow()}
+    db_progress = LearnerProgress(**values, userId=current_user.userId)
     db.add(db_progress)
-    db.commit()
-    db.refresh(db_progress)
+    await add_progress_to_rollups(db, current_user.userId, [values])
+    await db.commit()
+    await db.refresh(db_progress)
     return db_progress
 
 
 @router.get("/progress", response_model=List[LearnerProgressSchema])
-def get_progress(
+async def get_progress(
+    response: Response,
     module: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Get learner progress, optionally filtered by module"""
-    query = db.query(LearnerProgress).filter(LearnerProgress.userId == current_user.userId)
+    """Get learner progress, oldest first, optionally filtered by module"""
+    statement = select(LearnerProgress).where(LearnerProgress.userId == current_user.userId)
     if module:
-        query = query.filter(LearnerProgress.moduleName == module)
-    return query.all()
+        statement = statement.where(LearnerProgress.moduleName == module)
+    
+    rows, next_cursor = await paginate_query(db, statement, LearnerProgress, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
 
 
-@router.post("/quiz/attempt", response_model=QuizAttemptSchema)
-def record_quiz_attempt(
+@router.post("/quiz/attempt", response_model=QuizAttemptSchema, responses={202: {"model": QueuedEvent}})
+async def record_quiz_attempt(
     attempt: QuizAttemptCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Record a quiz attempt"""
+    """
+    Record a quiz attempt.
+    
+    With write-behind enabled the attempt is queued and 202 is returned; it is
+    stored with the next batch. A full queue falls back to an immediate insert.
+    """
+    queued = _queue_attempt(QuizAttempt, attempt.model_dump(), current_user.userId)
+    if queued is not None:
+        return queued
     db_attempt = QuizAttempt(**attempt.model_dump(), userId=current_user.userId)
     db.add(db_attempt)
-    db.commit()
-    db.refresh(db_attempt)
+    await db.commit()
+    await db.refresh(db_attempt)
     return db_attempt
 
 
+def _quiz_attempts_statement(model, user_id: int, quiz_type: Optional[str]):
+    """Select a learner's quiz attempts from the live or the archive table"""
+    statement = select(model).where(model.userId == user_id)
+    if quiz_type:
+        statement = statement.where(model.quizType == quiz_type)
+    return statement
+
+
 @router.get("/quiz/attempts", response_model=List[QuizAttemptSchema])
-def get_quiz_attempts(
+async def get_quiz_attempts(
+    response: Response,
     quiz_type: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Get quiz attempts"""
-    query = db.query(QuizAttempt).filter(QuizAttempt.userId == current_user.userId)
-    if quiz_type:
-        query = query.filter(QuizAttempt.quizType == quiz_type)
-    return query.order_by(QuizAttempt.createdAt.desc()).all()
+    """
+    Get quiz attempts, newest first.
+    
+    Once the recent attempts run out, the page continues into the archived ones.
+    """
+    rows, next_cursor = await paginate_query(
+        db, _quiz_attempts_statement(QuizAttempt, current_user.userId, quiz_type),
+        QuizAttempt, cursor, limit, descending=True
+    )
+    if next_cursor is None:
+        archived_page = await paginate_query(
+            db, _quiz_attempts_statement(ArchivedQuizAttempt, current_user.userId, quiz_type),
+            ArchivedQuizAttempt, cursor, limit, descending=True
+        )
+        rows, next_cursor = merge_pages([(rows, None), archived_page], limit, descending=True)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
 
 
-@router.post("/pronunciation/attempt", response_model=PronunciationAttemptSchema)
-def record_pronunciation(
+@router.post("/pronunciation/attempt", response_model=PronunciationAttemptSchema, responses={202: {"model": QueuedEvent}})
+async def record_pronunciation(
     attempt: PronunciationAttemptCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Record a pronunciation practice attempt"""
+    """
+    Record a pronunciation practice attempt.
+    
+    With write-behind enabled the attempt is queued and 202 is returned; it is
+    stored with the next batch. A full queue falls back to an immediate insert.
+    """
+    queued = _queue_attempt(PronunciationAttempt, attempt.model_dump(), current_user.userId)
+    if queued is not None:
+        return queued
     db_attempt = PronunciationAttempt(**attempt.model_dump(), userId=current_user.userId)
     db.add(db_attempt)
-    db.commit()
-    db.refresh(db_attempt)
+    await db.commit()
+    await db.refresh(db_attempt)
     return db_attempt
 
 
+@router.post("/events/batch", response_model=EventBatchResult)
+async def record_event_batch(
+    events: List[LearnerEvent],
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Record a mixed batch of progress, quiz and pronunciation events.
+    
+    The whole batch is validated before anything is written, then each table
+    gets one executemany insert inside a single transaction, so a 20-question
+    quiz costs one request and one commit instead of twenty.
+    """
+    if len(events) > EVENTS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {EVENTS_BATCH_MAX_ITEMS} events"
+        )
+    
+    created_at = datetime.utcnow()
+    positions = {event_type: [] for event_type in EVENT_MODELS}
+    rows = {event_type: [] for event_type in EVENT_MODELS}
+    for index, event in enumerate(events):
+        positions[event.type].append(index)
+        rows[event.type].append({**event.model_dump(exclude={"type"}), "userId": current_user.userId, "createdAt": created_at})
+    
+    ids = [None] * len(events)
+    for event_type, model in EVENT_MODELS.items():
+        if not rows[event_type]:
+            continue
+        # A Core insert of the table is one executemany; the ORM bulk path would run
+        # (and be reported as) one statement per row where ordered RETURNING is unbatched
+        new_ids = (await db.scalars(
+            insert(model.__table__).returning(model.id, sort_by_parameter_order=True),
+            rows[event_type]
+        )).all()
+        for index, new_id in zip(positions[event_type], new_ids):
+            ids[index] = new_id
+    await add_progress_to_rollups(db, current_user.userId, rows["progress"])
+    await db.commit()
+    
+    return {"created": len(events), "ids": ids}
+
+
+@router.post("/sync/journal", response_model=JournalSyncResult)
+async def sync_journal(
+    entries: List[JournalEntry],
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Upload a journal of events recorded offline; safe to retry.
+    
+    Entries are stored in seq order with insert-or-ignore on the learner's
+    (userId, clientEventId) unique index, so entries already stored by an
+    earlier, possibly interrupted, sync are skipped; attempts whose original
+    was archived since are looked up in the archive and skipped too. Each chunk of
+    SYNC_JOURNAL_COMMIT_SIZE entries is committed on its own; the returned
+    high-water mark is the highest seq stored, up to which the client may
+    truncate its queue.
+    """
+    if len(entries) > SYNC_JOURNAL_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A journal upload may contain at most {SYNC_JOURNAL_MAX_ENTRIES} entries"
+        )
+    
+    entries = sorted(entries, key=lambda entry: entry.seq)
+    insert_for_dialect = dialect_insert(db.bind)
+    synced_at = datetime.utcnow()
+    seen = set()
+    created = 0
+    for start in range(0, len(entries), SYNC_JOURNAL_COMMIT_SIZE):
+        rows = {event_type: [] for event_type in EVENT_MODELS}
+        for entry in entries[start:start + SYNC_JOURNAL_COMMIT_SIZE]:
+            client_event_id = str(entry.clientEventId)
+            if client_event_id in seen:
+                continue
+            seen.add(client_event_id)
+            rows[entry.event.type].append({
+                **entry.event.model_dump(exclude={"type"}),
+                "userId": current_user.userId,
+                "clientEventId": client_event_id,
+                "createdAt": entry.occurredAt or synced_at,
+            })
+        
+        for event_type, archive in ARCHIVE_MODELS.items():
+            if not rows[event_type]:
+                continue
+            archived = set((await db.scalars(
+                select(archive.clientEventId)
+                .where(archive.userId == current_user.userId, archive.clientEventId.in_(
+                    [row["clientEventId"] for row in rows[event_type]]
+                ))
+                .execution_options(batched=True)  # Once per chunk, not an N+1 pattern
+            )).all())
+            if archived:
+                rows[event_type] = [row for row in rows[event_type] if row["clientEventId"] not in archived]
+        
+        for event_type, model in EVENT_MODELS.items():
+            if not rows[event_type]:
+                continue
+            # RETURNING only yields the rows actually inserted, not the ignored duplicates
+            statement = insert_for_dialect(model).on_conflict_do_nothing(
+                index_elements=["userId", "clientEventId"]
+            )
+            if model is LearnerProgress:
+                inserted = (await db.execute(statement.returning(*model.__table__.c), rows[event_type])).mappings().all()
+                await add_progress_to_rollups(db, current_user.userId, inserted)
+            else:
+                inserted = (await db.scalars(statement.returning(model.id), rows[event_type])).all()
+            created += len(inserted)
+        await db.commit()
+    
+    return {
+        "received": len(entries),
+        "created": created,
+        "duplicates": len(entries) - created,
+        "highWaterMark": entries[-1].seq if entries else None
+    }
+
+
 @router.post("/session/start", response_model=LearningSessionSchema)
-def start_learning_session(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def start_learning_session(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Start a new learning session"""
-    db_session = LearningSession(userId=current_user.userId)
+    db_session = LearningSession(userId=current_user.userId, createdAt=datetime.utcnow())
     db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
+    await add_session_to_rollups(db, current_user.userId, sessions=1, session_at=db_session.createdAt)
+    await db.commit()
+    await db.refresh(db_session)
     return db_session
 
 
 @router.put("/session/{session_id}", response_model=LearningSessionSchema)
-def end_learning_session(
+async def end_learning_session(
     session_id: int,
     session_data: LearningSessionBase,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """End a learning session with final stats"""
-    session = db.query(LearningSession).filter(
-        LearningSession.id == session_id,
-        LearningSession.userId == current_user.userId
-    ).first()
-    if not session:
+    # A no-op update locks the row before its time is read, so concurrent updates
+    # take turns and each applies its rollup delta to the value the last one left
+    locked = (await db.execute(
+        update(LearningSession)
+        .where(LearningSession.id == session_id, LearningSession.userId == current_user.userId)
+        .values(totalTimeSpent=LearningSession.totalTimeSpent)
+        .returning(LearningSession.totalTimeSpent)
+    )).first()
+    if locked is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
+    previous_time = locked.totalTimeSpent or 0
+    session = await db.get(LearningSession, session_id)
     for key, value in session_data.model_dump(exclude_unset=True).items():
         setattr(session, key, value)
     
-    db.commit()
-    db.refresh(session)
+    if (session.totalTimeSpent or 0) != previous_time:
+        await add_session_to_rollups(db, current_user.userId, time_spent=(session.totalTimeSpent or 0) - previous_time)
+    await db.commit()
+    await db.refresh(session)
     return session
@@ -2,70 +2,75 @@
 Reading Text Routes
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.database import get_db
-from app.models import User, ReadingText
+from app.models import ReadingText
 from app.schemas import ReadingTextCreate, ReadingText as ReadingTextSchema
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_principal
 
 router = APIRouter(prefix="/api/reading-texts", tags=["Reading Texts"])
 
 
 @router.get("", response_model=List[ReadingTextSchema])
-def get_reading_texts(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_reading_texts(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get all reading texts for current user"""
-    return db.query(ReadingText).filter(ReadingText.userId == current_user.userId).all()
+    return (await db.scalars(select(ReadingText).where(ReadingText.userId == current_user.userId))).all()
 
 
 @router.post("", response_model=ReadingTextSchema)
-def create_reading_text(
+async def create_reading_text(
     text: ReadingTextCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Create a new reading text"""
     db_text = ReadingText(**text.model_dump(), userId=current_user.userId)
     db.add(db_text)
-    db.commit()
-    db.refresh(db_text)
+    await db.commit()
+    await db.refresh(db_text)
     return db_text
 
 
 @router.get("/{text_id}", response_model=ReadingTextSchema)
-def get_reading_text(
+async def get_reading_text(
     text_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get a specific reading text by ID"""
-    text = db.query(ReadingText).filter(
-        ReadingText.id == text_id,
-        ReadingText.userId == current_user.userId
-    ).first()
+    text = await db.scalar(
+        select(ReadingText).where(
+            ReadingText.id == text_id,
+            ReadingText.userId == current_user.userId
+        )
+    )
     if not text:
         raise HTTPException(status_code=404, detail="Reading text not found")
     return text
 
 
 @router.delete("/{text_id}")
-def delete_reading_text(
+async def delete_reading_text(
     text_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Delete a reading text"""
-    text = db.query(ReadingText).filter(
-        ReadingText.id == text_id,
-        ReadingText.userId == current_user.userId
-    ).first()
+    text = await db.scalar(
+        select(ReadingText).where(
+            ReadingText.id == text_id,
+            ReadingText.userId == current_user.userId
+        )
+    )
     if not text:
         raise HTTPException(status_code=404, detail="Reading text not found")
     
-    db.delete(text)
-    db.commit()
+    await db.delete(text)
+    await db.commit()
     return {"message": "Reading text deleted successfully"}
@@ -2,14 +2,14 @@
 File Upload Routes
 """
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import base64
 
 from app.database import get_db
 from app.models import User
 from app.core.firebase import upload_image_to_firebase, upload_audio_to_firebase
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_principal, get_current_user, invalidate_user
 
 router = APIRouter(prefix="/api/upload", tags=["File Uploads"])
 
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/api/upload", tags=["File Uploads"])
 @router.post("/image")
 async def upload_image(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Upload image to Firebase Storage"""
     try:
@@ -33,7 +33,7 @@ async def upload_image(
 @router.post("/audio")
 async def upload_audio(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Upload audio file to Firebase Storage"""
     try:
@@ -50,7 +50,7 @@ async def upload_audio(
 async def upload_profile_photo(
     image_base64: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload profile photo and update user"""
     try:
@@ -59,7 +59,8 @@ async def upload_profile_photo(
         
         # Update user profile photo
         current_user.profilePhoto = url
-        db.commit()
+        await db.commit()
+        invalidate_user(current_user.userId)
         
         return {"url": url, "message": "Profile photo updated"}
     except Exception as e:
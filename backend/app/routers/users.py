@@ -2,44 +2,46 @@
 User Routes: Get and Update User
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import User
 from app.schemas import UserBase, User as UserSchema
-from app.dependencies import get_current_user
+from app.dependencies import Principal, get_current_principal, invalidate_user
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
 
 @router.get("/{user_id}", response_model=UserSchema)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get user by ID"""
-    user = db.query(User).filter(User.userId == user_id).first()
+    user = await db.scalar(select(User).where(User.userId == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
 @router.put("/{user_id}", response_model=UserSchema)
-def update_user(
+async def update_user(
     user_id: int,
     user_update: UserBase,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Update user by ID"""
-    user = db.query(User).filter(User.userId == user_id).first()
+    user = await db.scalar(select(User).where(User.userId == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     for key, value in user_update.model_dump(exclude_unset=True).items():
         setattr(user, key, value)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    invalidate_user(user_id)
+    await db.refresh(user)
     return user
@@ -1,90 +1,407 @@
 """
 Word Routes
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from datetime import datetime
 
+from app.config import WORDS_CACHE_MAX_AGE, WORDS_MAX_PAGE_SIZE, WORDS_BULK_MAX_ITEMS, MEDIA_BASE_URL
 from app.database import get_db
-from app.models import User, OriginalWord
-from app.schemas import WordCreate, Word
-from app.dependencies import get_current_user
+from app.models import OriginalWord
+from app.schemas import WordCreate, Word, WordChanges, WordBulkRequest, WordBulkItemResult, WordBulkResult
+from app.core.catalog import (
+    CatalogSnapshot, WordProjection, FULL_PROJECTION, LANGUAGE_FIELDS, get_catalog, rebuild_catalog,
+    get_catalog_version, bump_catalog_version
+)
+from app.core.pagination import NEXT_CURSOR_HEADER, paginate_sorted
+from app.core.search import search_word_ids
+from app.core.media import MEDIA_KEYS_CONTEXT
+from app.dependencies import Principal, get_current_principal
 
 router = APIRouter(prefix="/api/words", tags=["Words"])
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against the catalog ETag (weak comparison per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+async def _read_catalog(request: Request, db: AsyncSession) -> CatalogSnapshot:
+    """
+    Get the catalog for a word read.
+
+    A client revalidating an ETag gets the version confirmed against the
+    database first, so no worker answers 304 for a catalog that another worker
+    or a script has since changed.
+    """
+    return await get_catalog(db, revalidate="if-none-match" in request.headers)
+
+
+def _parse_languages(lang: Optional[str]) -> Optional[frozenset]:
+    """Parse a comma-separated ?lang= value into language names"""
+    if lang is None:
+        return None
+    languages = frozenset(name.strip().lower() for name in lang.split(",") if name.strip())
+    unknown = languages - set(LANGUAGE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown languages: {', '.join(sorted(unknown))}")
+    return languages
+
+
+def get_projection(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    lang: Optional[str] = Query(None, description="Comma-separated languages to return: english, spanish, tamil"),
+    media: Literal["url", "keys"] = Query("url", description="Return media as full URLs or as storage keys")
+) -> WordProjection:
+    """
+    Resolve the ?fields=, ?lang= and ?media= parameters into a word projection.
+
+    lang drops the name and sound fields of the languages not requested; fields
+    keeps only the listed fields. The id is always returned. media=keys leaves
+    media as storage keys to be joined with the X-Media-Base-Url header.
+    """
+    media_keys = media == "keys"
+    if fields is None and lang is None:
+        return WordProjection(None, media_keys)
+    
+    selected = set(Word.model_fields)
+    if fields is not None:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - selected
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        selected = requested
+    languages = _parse_languages(lang)
+    if languages is not None:
+        for language, language_fields in LANGUAGE_FIELDS.items():
+            if language not in languages:
+                selected -= set(language_fields)
+    return WordProjection(frozenset(selected | {"id"}), media_keys)
+
+
+def _catalog_response(
+    request: Request,
+    catalog: CatalogSnapshot,
+    content,
+    next_cursor: Optional[str] = None,
+    projection: WordProjection = FULL_PROJECTION
+) -> Response:
+    """
+    Build a cacheable response for data read from the catalog snapshot.
+
+    Every word read is a pure function of the catalog and the request URL, so the
+    catalog ETag is a valid strong validator for all of them. Unchanged catalogs
+    answer 304 without serializing anything; callers pass a catalog from
+    _read_catalog, whose version was confirmed if the request is conditional.
+    """
+    headers = {
+        "ETag": catalog.etag,
+        "Cache-Control": f"public, max-age={WORDS_CACHE_MAX_AGE}, must-revalidate",
+        "X-Media-Base-Url": MEDIA_BASE_URL,
+    }
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if _etag_matches(request, catalog.etag):
+        return Response(status_code=304, headers=headers)
+    
+    if isinstance(content, Word):
+        body = content.model_dump_json().encode()
+    else:
+        body = catalog.serialize(content, projection)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("", response_model=List[Word])
-def get_all_words(skip: int = 0, limit: int = 1000, db: Session = Depends(get_db)):
-    """Get all words with pagination"""
-    return db.query(OriginalWord).offset(skip).limit(limit).all()
+async def get_all_words(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(WORDS_MAX_PAGE_SIZE, ge=1, le=WORDS_MAX_PAGE_SIZE),
+    projection: WordProjection = Depends(get_projection),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all words, paginated by cursor in creation order"""
+    catalog = await _read_catalog(request, db)
+    words, next_cursor = paginate_sorted(catalog.words, catalog.keys, cursor, limit)
+    if len(words) == len(catalog.words):
+        words = catalog.words
+    return _catalog_response(request, catalog, words, next_cursor, projection)
+
+
+@router.get("/changes", response_model=WordChanges)
+async def get_word_changes(since: int = Query(0, ge=0), db: AsyncSession = Depends(get_db)):
+    """
+    Get words inserted, updated or deleted after the client's catalog version.
+
+    since=0, or a version newer than the server's (e.g. after a database reset),
+    returns the whole live catalog with full=True.
+    """
+    version = await db.run_sync(get_catalog_version)
+    if since == 0 or since > version:
+        catalog = await get_catalog(db, revalidate=True)
+        return {"version": catalog.version, "full": True, "upserts": catalog.words, "deletes": []}
+    
+    changed = (await db.scalars(
+        select(OriginalWord).where(OriginalWord.version > since).order_by(OriginalWord.version, OriginalWord.id)
+    )).all()
+    return {
+        "version": version,
+        "full": False,
+        "upserts": [word for word in changed if word.deletedAt is None],
+        "deletes": [word.id for word in changed if word.deletedAt is not None]
+    }
+
+
+@router.get("/search", response_model=List[Word])
+async def search_words(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    lang: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    projection: WordProjection = Depends(get_projection),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search words by English, Spanish or Tamil name prefix, best match first.
+
+    lang restricts both the names searched and the language fields returned.
+    """
+    catalog = await _read_catalog(request, db)
+    ids = await search_word_ids(db, q, _parse_languages(lang), limit)
+    words = [catalog.by_id[word_id] for word_id in ids if word_id in catalog.by_id]
+    return _catalog_response(request, catalog, words, projection=projection)
 
 
 @router.get("/initial/{initial}", response_model=List[Word])
-def get_words_by_initial(initial: str, db: Session = Depends(get_db)):
+async def get_words_by_initial(
+    initial: str,
+    request: Request,
+    projection: WordProjection = Depends(get_projection),
+    db: AsyncSession = Depends(get_db)
+):
     """Get words by initial letter"""
-    return db.query(OriginalWord).filter(OriginalWord.initials == initial.upper()).all()
+    catalog = await _read_catalog(request, db)
+    return _catalog_response(request, catalog, catalog.by_initials.get(initial.upper(), ()), projection=projection)
 
 
 @router.get("/type/{word_type}", response_model=List[Word])
-def get_words_by_type(word_type: str, db: Session = Depends(get_db)):
+async def get_words_by_type(
+    word_type: str,
+    request: Request,
+    projection: WordProjection = Depends(get_projection),
+    db: AsyncSession = Depends(get_db)
+):
     """Get words by type"""
-    return db.query(OriginalWord).filter(OriginalWord.type == word_type).all()
+    catalog = await _read_catalog(request, db)
+    return _catalog_response(request, catalog, catalog.by_type.get(word_type, ()), projection=projection)
+
+
+@router.get("/tema/{tema}", response_model=List[Word])
+async def get_words_by_tema(
+    tema: str,
+    request: Request,
+    projection: WordProjection = Depends(get_projection),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get words by theme (tema)"""
+    catalog = await _read_catalog(request, db)
+    return _catalog_response(request, catalog, catalog.by_tema.get(tema, ()), projection=projection)
+
+
+@router.get("/letra/{letra}", response_model=List[Word])
+async def get_words_by_letra(
+    letra: str,
+    request: Request,
+    projection: WordProjection = Depends(get_projection),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get words by Spanish letter (letra)"""
+    catalog = await _read_catalog(request, db)
+    return _catalog_response(request, catalog, catalog.by_letra.get(letra, ()), projection=projection)
 
 
 @router.get("/{word_id}", response_model=Word)
-def get_word(word_id: int, db: Session = Depends(get_db)):
+async def get_word(word_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """Get a specific word by ID"""
-    word = db.query(OriginalWord).filter(OriginalWord.id == word_id).first()
+    catalog = await _read_catalog(request, db)
+    word = catalog.by_id.get(word_id)
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
-    return word
+    return _catalog_response(request, catalog, word)
 
 
 @router.post("", response_model=Word)
-def create_word(
+async def create_word(
     word: WordCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Create a new word"""
-    db_word = OriginalWord(**word.model_dump())
+    version = await db.run_sync(bump_catalog_version)
+    db_word = OriginalWord(**word.model_dump(context=MEDIA_KEYS_CONTEXT), version=version)
     db.add(db_word)
-    db.commit()
-    db.refresh(db_word)
+    await db.commit()
+    await db.refresh(db_word)
+    await rebuild_catalog(db)
     return db_word
 
 
+@router.post("/bulk", response_model=WordBulkResult)
+async def bulk_write_words(
+    batch: WordBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Apply a batch of word upserts and deletes in a single transaction.
+
+    Every item is validated before anything is written. If any item is invalid
+    nothing is applied and the per-item results are returned with status 422,
+    valid items being reported as skipped.
+    """
+    if len(batch.upserts) + len(batch.deletes) > WORDS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A bulk request may contain at most {WORDS_BULK_MAX_ITEMS} items"
+        )
+    
+    # Resolve every id and englishName key against the live catalog in one query
+    ids = {item.id for item in [*batch.upserts, *batch.deletes] if item.id is not None}
+    names = {item.englishName for item in [*batch.upserts, *batch.deletes]
+             if item.id is None and item.englishName}
+    existing = (await db.execute(
+        select(OriginalWord.id, OriginalWord.englishName).where(
+            OriginalWord.deletedAt.is_(None),
+            or_(OriginalWord.id.in_(ids), OriginalWord.englishName.in_(names))
+        )
+    )).all()
+    live_ids = {row.id for row in existing}
+    ids_by_name = {}
+    for row in existing:
+        ids_by_name.setdefault(row.englishName, []).append(row.id)
+    
+    def resolve(item):
+        if item.id is not None:
+            return (item.id, None) if item.id in live_ids else (None, "Word not found")
+        if not item.englishName:
+            return None, "Either id or englishName is required"
+        matches = ids_by_name.get(item.englishName, [])
+        if len(matches) > 1:
+            return None, "englishName matches more than one word; use id instead"
+        return (matches[0] if matches else None), None
+    
+    results = []
+    inserts, updates = [], []
+    touched_ids, created_names = set(), set()
+    for index, item in enumerate(batch.upserts):
+        word_id, error = resolve(item)
+        if error is None and (word_id in touched_ids or (word_id is None and item.englishName in created_names)):
+            error = "Word appears more than once in the batch"
+        if error:
+            results.append(WordBulkItemResult(operation="upsert", index=index, status="error", error=error))
+        elif word_id is None:
+            created_names.add(item.englishName)
+            inserts.append(item.model_dump(exclude={"id"}, context=MEDIA_KEYS_CONTEXT))
+            results.append(WordBulkItemResult(operation="upsert", index=index, status="created"))
+        else:
+            touched_ids.add(word_id)
+            updates.append({**item.model_dump(exclude_unset=True, exclude={"id"}, context=MEDIA_KEYS_CONTEXT), "id": word_id})
+            results.append(WordBulkItemResult(operation="upsert", index=index, status="updated", id=word_id))
+    
+    deletes = []
+    for index, item in enumerate(batch.deletes):
+        word_id, error = resolve(item)
+        if error is None and word_id is None:
+            error = "Word not found"
+        if error is None and word_id in touched_ids:
+            error = "Word appears more than once in the batch"
+        if error:
+            results.append(WordBulkItemResult(operation="delete", index=index, status="error", error=error))
+        else:
+            touched_ids.add(word_id)
+            deletes.append(word_id)
+            results.append(WordBulkItemResult(operation="delete", index=index, status="deleted", id=word_id))
+    
+    if any(result.status == "error" for result in results):
+        for result in results:
+            if result.status != "error":
+                result.status = "skipped"
+        raise HTTPException(status_code=422, detail=[result.model_dump() for result in results])
+    
+    # Apply everything with one executemany per statement inside one transaction
+    version = await db.run_sync(bump_catalog_version)
+    now = datetime.utcnow()
+    new_ids = []
+    if inserts:
+        new_ids = (await db.scalars(
+            insert(OriginalWord).returning(OriginalWord.id, sort_by_parameter_order=True),
+            [{**values, "version": version} for values in inserts]
+        )).all()
+    changes = [{**values, "version": version, "updatedAt": now} for values in updates]
+    changes += [{"id": word_id, "version": version, "updatedAt": now, "deletedAt": now} for word_id in deletes]
+    if changes:
+        await db.execute(update(OriginalWord), changes)
+    await db.commit()
+    await rebuild_catalog(db)
+    
+    created = iter(new_ids)
+    for result in results:
+        if result.status == "created":
+            result.id = next(created)
+    return {"version": version, "results": results}
+
+
 @router.put("/{word_id}", response_model=Word)
-def update_word(
+async def update_word(
     word_id: int,
     word_update: WordCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Update a word"""
-    word = db.query(OriginalWord).filter(OriginalWord.id == word_id).first()
+    word = await db.scalar(
+        select(OriginalWord).where(OriginalWord.id == word_id, OriginalWord.deletedAt.is_(None))
+    )
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
     
-    for key, value in word_update.model_dump(exclude_unset=True).items():
+    for key, value in word_update.model_dump(exclude_unset=True, context=MEDIA_KEYS_CONTEXT).items():
         setattr(word, key, value)
+    word.version = await db.run_sync(bump_catalog_version)
     
-    db.commit()
-    db.refresh(word)
+    await db.commit()
+    await db.refresh(word)
+    await rebuild_catalog(db)
     return word
 
 
 @router.delete("/{word_id}")
-def delete_word(
+async def delete_word(
     word_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    """Delete a word"""
-    word = db.query(OriginalWord).filter(OriginalWord.id == word_id).first()
+    """Delete a word, leaving a tombstone for clients syncing via /changes"""
+    word = await db.scalar(
+        select(OriginalWord).where(OriginalWord.id == word_id, OriginalWord.deletedAt.is_(None))
+    )
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
     
-    db.delete(word)
-    db.commit()
+    word.version = await db.run_sync(bump_catalog_version)
+    word.deletedAt = datetime.utcnow()
+    await db.commit()
+    await rebuild_catalog(db)
     return {"message": "Word deleted successfully"}
@@ -1,16 +1,20 @@
 # Schemas package
 from app.schemas.user import (
     UserBase, UserCreate, UserLogin, User, Token,
+    BulkRegistrationRow, BulkRegistrationResult,
     FamilyMemberBase, FamilyMemberCreate, FamilyMember
 )
 from app.schemas.word import (
-    WordBase, WordCreate, Word,
+    WordBase, WordCreate, Word, WordChanges,
+    WordUpsert, WordDeleteKey, WordBulkRequest, WordBulkItemResult, WordBulkResult,
     ReadingTextBase, ReadingTextCreate, ReadingText
 )
 from app.schemas.progress import (
     LearnerProgressBase, LearnerProgressCreate, LearnerProgress,
     QuizAttemptBase, QuizAttemptCreate, QuizAttempt,
     PronunciationAttemptBase, PronunciationAttemptCreate, PronunciationAttempt,
+    ProgressEvent, QuizEvent, PronunciationEvent, LearnerEvent, EventBatchResult,
+    JournalEntry, JournalSyncResult, QueuedEvent,
     LearningSessionBase, LearningSessionCreate, LearningSession,
-    LearnerAnalytics, ModuleStats
+    LearnerAnalytics, ModuleStats, AttemptDailyStats
 )
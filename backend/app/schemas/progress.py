@@ -1,9 +1,10 @@
 """
 Progress and Analytics Schemas
 """
-from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Annotated, Literal, Optional, List, Union
+from datetime import date, datetime
+from uuid import UUID
 
 
 # Learner Progress Schemas
@@ -78,6 +79,47 @@ class PronunciationAttempt(PronunciationAttemptBase):
         from_attributes = True
 
 
+# Batched Event Schemas
+class ProgressEvent(LearnerProgressCreate):
+    type: Literal["progress"]
+
+
+class QuizEvent(QuizAttemptCreate):
+    type: Literal["quiz"]
+
+
+class PronunciationEvent(PronunciationAttemptCreate):
+    type: Literal["pronunciation"]
+
+
+# One item of POST /api/events/batch, told apart by its "type" field
+LearnerEvent = Annotated[Union[ProgressEvent, QuizEvent, PronunciationEvent], Field(discriminator="type")]
+
+
+class EventBatchResult(BaseModel):
+    created: int
+    ids: List[int]  # Id of the row stored for each event, in request order
+
+
+class JournalEntry(BaseModel):
+    seq: int = Field(ge=0)  # Client's increasing sequence number of the entry
+    clientEventId: UUID  # Generated once on the device, reused on every retry
+    occurredAt: Optional[datetime] = None  # When the event happened offline; defaults to sync time
+    event: LearnerEvent
+
+
+class JournalSyncResult(BaseModel):
+    received: int
+    created: int
+    duplicates: int  # Entries already stored by an earlier sync or repeated in this one
+    highWaterMark: Optional[int] = None  # Highest seq now stored; the client may drop entries up to it
+
+
+class QueuedEvent(BaseModel):
+    status: Literal["queued"] = "queued"
+    createdAt: datetime  # Timestamp the row will be stored with once flushed
+
+
 # Learning Session Schemas
 class LearningSessionBase(BaseModel):
     sessionStart: datetime
@@ -118,3 +160,12 @@ class ModuleStats(BaseModel):
     averageScore: float
     totalAttempts: int
     timeSpent: int
+
+
+class AttemptDailyStats(BaseModel):
+    day: date
+    attemptType: Literal["quiz", "pronunciation"]
+    category: str  # quizType for quiz attempts, empty for pronunciation
+    attempts: int
+    correct: int
+    averageScore: Optional[float] = None  # Over pronunciation attempts that had a score
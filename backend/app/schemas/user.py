@@ -2,7 +2,7 @@
 User and Family Member Schemas
 """
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -44,6 +44,20 @@ class Token(BaseModel):
     user: User
 
 
+class BulkRegistrationRow(BaseModel):
+    row: int  # Position in the submitted list (CSV rows start at 1 after the header)
+    username: Optional[str] = None
+    userId: Optional[int] = None
+    access_token: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkRegistrationResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkRegistrationRow]
+
+
 # Family Member Schemas
 class FamilyMemberBase(BaseModel):
     name: str
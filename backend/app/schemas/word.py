@@ -1,10 +1,12 @@
 """
 Word and Reading Text Schemas
 """
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, SerializationInfo, field_serializer, field_validator
+from typing import Optional, List
 from datetime import datetime
 
+from app.core.media import MEDIA_FIELDS, MEDIA_KEYS_CONTEXT, to_media_key, resolve_media_url
+
 
 # Word Schemas
 class WordBase(BaseModel):
@@ -21,6 +23,19 @@ class WordBase(BaseModel):
     type: Optional[str] = None
     tema: Optional[str] = None
     letra: Optional[str] = None
+    
+    @field_validator(*MEDIA_FIELDS)
+    @classmethod
+    def store_media_key(cls, value: Optional[str]) -> Optional[str]:
+        """Accept full download URLs but keep only the storage key"""
+        return to_media_key(value)
+    
+    @field_serializer(*MEDIA_FIELDS)
+    def expand_media_key(self, value: Optional[str], info: SerializationInfo) -> Optional[str]:
+        """Expand storage keys to URLs unless serialized with MEDIA_KEYS_CONTEXT"""
+        if info.context == MEDIA_KEYS_CONTEXT:
+            return value
+        return resolve_media_url(value)
 
 
 class WordCreate(WordBase):
@@ -30,12 +45,50 @@ class WordCreate(WordBase):
 class Word(WordBase):
     id: int
     createdAt: datetime
+    updatedAt: Optional[datetime] = None
     dateCompleted: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
 
+class WordUpsert(WordBase):
+    """Bulk upsert item: updates the word with this id, or the live word with this englishName, else creates it"""
+    id: Optional[int] = None
+
+
+class WordDeleteKey(BaseModel):
+    """Bulk delete item keyed by id or englishName"""
+    id: Optional[int] = None
+    englishName: Optional[str] = None
+
+
+class WordBulkRequest(BaseModel):
+    upserts: List[WordUpsert] = []
+    deletes: List[WordDeleteKey] = []
+
+
+class WordBulkItemResult(BaseModel):
+    operation: str  # upsert or delete
+    index: int  # Position in the request's upserts or deletes list
+    status: str  # created, updated, deleted, skipped or error
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class WordBulkResult(BaseModel):
+    version: int
+    results: List[WordBulkItemResult]
+
+
+class WordChanges(BaseModel):
+    """Words changed since a client's catalog version"""
+    version: int
+    full: bool  # True when upserts replace the client's whole catalog
+    upserts: List[Word]
+    deletes: List[int]
+
+
 # Reading Text Schemas
 class ReadingTextBase(BaseModel):
     title: str
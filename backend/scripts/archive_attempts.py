@@ -0,0 +1,153 @@
+"""
+Move old quiz and pronunciation attempts into the archive and compact the database
+
+Attempts created before the horizon (ARCHIVE_AFTER_DAYS, rounded down to
+midnight UTC) are copied with their ids into the archive schema, which on
+SQLite is a separate attached database file, and deleted from the live
+tables. Each batch is first committed to the archive, then deleted from
+the live table and added to the per-learner daily totals in
+attemptDailyRollups in a second transaction, so the job can be stopped and
+rerun at any time. The main database is vacuumed
+afterwards to give the freed pages back; run it off-peak.
+
+Run from the backend directory:
+    python -m scripts.archive_attempts [days]
+"""
+import sys
+import os
+from datetime import datetime, time, timedelta
+
+# Add parent directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy import delete, func, select
+from app.config import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+from app.database import SessionLocal, engine, init_db, dialect_insert
+from app.models import (
+    QuizAttempt, PronunciationAttempt,
+    ArchivedQuizAttempt, ArchivedPronunciationAttempt, AttemptDailyRollup
+)
+
+# (live model, archive model, rollup attemptType)
+ARCHIVE_TARGETS = (
+    (QuizAttempt, ArchivedQuizAttempt, "quiz"),
+    (PronunciationAttempt, ArchivedPronunciationAttempt, "pronunciation"),
+)
+
+ROLLUP_KEY = ["userId", "day", "attemptType", "category"]
+ROLLUP_COUNTS = ["attempts", "correct", "scoreSum", "scoredAttempts"]
+
+
+def daily_rollups(attempt_type: str, rows) -> list:
+    """Total a batch of attempts per learner, day and category"""
+    totals = {}
+    for row in rows:
+        category = row.quizType if attempt_type == "quiz" else ""
+        key = (row.userId, row.createdAt.date(), category)
+        total = totals.setdefault(key, {
+            "userId": row.userId, "day": key[1], "attemptType": attempt_type, "category": category,
+            "attempts": 0, "correct": 0, "scoreSum": 0, "scoredAttempts": 0
+        })
+        total["attempts"] += 1
+        if attempt_type == "quiz" and row.isCorrect:
+            total["correct"] += 1
+        if attempt_type == "pronunciation" and row.accuracyScore is not None:
+            total["scoreSum"] += row.accuracyScore
+            total["scoredAttempts"] += 1
+    return list(totals.values())
+
+
+def archive_table(db, live, archive, attempt_type: str, cutoff: datetime) -> int:
+    """Move the attempts of one table created before cutoff, one committed batch at a time"""
+    insert_for_dialect = dialect_insert(db.bind)
+    rollup_statement = insert_for_dialect(AttemptDailyRollup)
+    rollup_statement = rollup_statement.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={name: getattr(AttemptDailyRollup, name) + rollup_statement.excluded[name] for name in ROLLUP_COUNTS}
+    )
+
+    # The newest row always stays, so SQLite (which reuses the highest rowid once it
+    # is deleted) never hands out an id that already exists in the archive
+    newest_id = db.scalar(select(func.max(live.id)))
+    if newest_id is None:
+        return 0
+
+    moved = 0
+    last_id = 0
+    while True:
+        # Walk the primary key forward so every batch is a range scan
+        rows = db.execute(
+            select(live.__table__)
+            .where(live.id > last_id, live.id < newest_id, live.createdAt < cutoff)
+            .order_by(live.id)
+            .limit(ARCHIVE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return moved
+
+        # The copy is committed on its own first: in WAL mode SQLite does not commit
+        # atomically across attached databases, so one transaction could keep the
+        # delete and lose the copy in a crash. Rows copied by an earlier run that
+        # stopped before its delete are skipped.
+        db.execute(insert_for_dialect(archive).on_conflict_do_nothing(index_elements=["id"]), [dict(row._mapping) for row in rows])
+        db.commit()
+
+        # The delete and the rollup stay together in the main database, so the
+        # daily totals count exactly the attempts no longer in the live table
+        db.execute(delete(live).where(live.id > last_id, live.id <= rows[-1].id, live.createdAt < cutoff))
+        db.execute(rollup_statement, daily_rollups(attempt_type, rows))
+        db.commit()
+
+        moved += len(rows)
+        last_id = rows[-1].id
+        print(f"   {live.__tablename__}: {moved} moved (up to id {last_id})")
+
+
+def compact(tables):
+    """Give the pages freed by the deletes back to the file system and refresh statistics"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("VACUUM")
+            # In WAL mode the rebuilt pages only reach the main file at a checkpoint
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        else:
+            for table in tables:
+                conn.exec_driver_sql(f'VACUUM ANALYZE "{table}"')
+
+
+def archive_attempts(days: int):
+    """Archive every attempt table and compact the database if anything moved"""
+    cutoff = datetime.combine((datetime.utcnow() - timedelta(days=days)).date(), time.min)
+    print(f"Archiving attempts created before {cutoff:%Y-%m-%d}")
+
+    db = SessionLocal()
+    moved_tables = []
+    try:
+        for live, archive, attempt_type in ARCHIVE_TARGETS:
+            moved = archive_table(db, live, archive, attempt_type, cutoff)
+            print(f"✅ {live.__tablename__}: {moved} attempts archived")
+            if moved:
+                moved_tables.append(live.__tablename__)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        db.rollback()
+        return
+    finally:
+        db.close()
+
+    if moved_tables:
+        compact(moved_tables)
+        print("✅ Database compacted")
+
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else ARCHIVE_AFTER_DAYS
+
+    print("🚀 Attempt Archival Script")
+    print("=" * 60)
+    print(f"This will move quiz and pronunciation attempts older than {days} days into the archive")
+    print("=" * 60)
+    init_db()
+    archive_attempts(days)
@@ -0,0 +1,115 @@
+"""
+Benchmark concurrent read/write throughput of the SQLite engine settings
+
+Runs the same mixed workload (quiz attempt inserts alongside paged reads of a
+learner's attempts) against an untuned engine and against the engine built
+with the configured WAL and pragma settings, each on a fresh database file.
+
+Run from the backend directory:
+    python -m scripts.benchmark_database [seconds] [readers] [writers]
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, create_db_engine
+from app.models import User, QuizAttempt
+
+SEED_ATTEMPTS = 5000
+
+
+def seed(session_factory):
+    """Create one learner with a history of quiz attempts"""
+    db = session_factory()
+    user = User(accessCode="bench", guardianName="Bench", learnerName="Bench", username="bench", password="x")
+    db.add(user)
+    db.commit()
+    db.add_all(QuizAttempt(userId=user.userId, quizType="alphabet", isCorrect=i % 2) for i in range(SEED_ATTEMPTS))
+    db.commit()
+    user_id = user.userId
+    db.close()
+    return user_id
+
+
+def run_workload(tuned: bool, seconds: float, readers: int, writers: int) -> dict:
+    """Run readers and writers concurrently for a fixed time and count completed operations"""
+    directory = tempfile.mkdtemp()
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", tuned=tuned)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    user_id = seed(session_factory)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def count(key):
+        with lock:
+            counts[key] += 1
+
+    def reader():
+        db = session_factory()
+        while time.monotonic() < deadline:
+            try:
+                db.query(QuizAttempt).filter(QuizAttempt.userId == user_id).order_by(
+                    QuizAttempt.createdAt.desc(), QuizAttempt.id.desc()
+                ).limit(20).all()
+                db.rollback()
+                count("reads")
+            except OperationalError:
+                db.rollback()
+                count("errors")
+        db.close()
+
+    def writer():
+        db = session_factory()
+        while time.monotonic() < deadline:
+            try:
+                db.add(QuizAttempt(userId=user_id, quizType="alphabet", isCorrect=1))
+                db.commit()
+                count("writes")
+            except OperationalError:
+                db.rollback()
+                count("errors")
+        db.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    return {key: value / seconds for key, value in counts.items()}
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    writers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    print("🚀 SQLite Engine Benchmark")
+    print("=" * 60)
+    print(f"{readers} readers, {writers} writers, {seconds:g}s per run")
+    print("=" * 60)
+
+    results = {}
+    for label, tuned in (("default", False), ("tuned", True)):
+        results[label] = run_workload(tuned, seconds, readers, writers)
+        rates = results[label]
+        print(f"  {label:<8} reads/s: {rates['reads']:>9.1f}   writes/s: {rates['writes']:>8.1f}   errors/s: {rates['errors']:>6.1f}")
+
+    for key in ("reads", "writes"):
+        baseline = results["default"][key]
+        if baseline:
+            print(f"  {key} speedup: {results['tuned'][key] / baseline:.2f}x")
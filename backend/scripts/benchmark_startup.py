@@ -0,0 +1,76 @@
+"""
+Benchmark cold import time of the API application
+
+Imports app.main in fresh interpreters and reports the wall time, followed by
+the slowest modules from one `python -X importtime` run. An optional budget
+makes the script exit with status 1 when the median import time exceeds it.
+
+Run from the backend directory:
+    python -m scripts.benchmark_startup [runs] [budget_ms]
+"""
+import sys
+import os
+import statistics
+import subprocess
+import time
+
+# Add parent directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+IMPORT_COMMAND = "import app.main"
+SLOWEST_MODULES = 12
+
+
+def time_cold_import() -> float:
+    """Import app.main in a new interpreter and return the wall time in milliseconds"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", IMPORT_COMMAND], cwd=backend_dir, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def slowest_modules(limit: int) -> list:
+    """Get (cumulative ms, module) for the slowest top-level imports below app.main"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_COMMAND],
+        cwd=backend_dir, check=True, capture_output=True, text=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[13:]:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # Depth is the indentation of the module name; keep app.main and its direct imports
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:
+            modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)[:limit]
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    print("🚀 Startup Benchmark")
+    print("=" * 60)
+    print(f"Cold `{IMPORT_COMMAND}`, {runs} runs")
+    print("=" * 60)
+
+    # The first run warms the OS file cache and bytecode, so it is not counted
+    time_cold_import()
+    timings = [time_cold_import() for _ in range(runs)]
+    median = statistics.median(timings)
+    print(f"  min {min(timings):7.1f} ms   median {median:7.1f} ms   max {max(timings):7.1f} ms")
+
+    print("\nSlowest imports (cumulative):")
+    for milliseconds, module in slowest_modules(SLOWEST_MODULES):
+        print(f"  {milliseconds:7.1f} ms  {module}")
+
+    if budget_ms is not None:
+        if median > budget_ms:
+            print(f"\n❌ Median import time {median:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+            sys.exit(1)
+        print(f"\n✅ Median import time is within the {budget_ms:.0f} ms budget")
@@ -0,0 +1,206 @@
+"""
+Check that every database query issued by the API routes uses an index
+
+Seeds a temporary SQLite database, calls each route through the ASGI app,
+records every SQL statement the routes execute and runs EXPLAIN QUERY PLAN
+on it. Exits with status 1 if any statement falls back to a full table scan.
+
+Run from the backend directory:
+    python -m scripts.check_query_plans
+"""
+import sys
+import os
+import asyncio
+import json
+import tempfile
+import uuid
+
+# Add parent directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+# Point the app at a scratch database before it is imported
+DATABASE_URL = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'plans.db')}"
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ["AUTO_CREATE_SCHEMA"] = "true"
+
+from sqlalchemy import event
+from app.database import Base, async_engine, create_db_engine
+from app.main import app
+
+# Full scans that are intended, as (table, text identifying the statement)
+ALLOWED_SCANS = [
+    # The word catalog is loaded into memory in full
+    ("originalWords", '"originalWords"."deletedAt" IS NULL ORDER BY "originalWords"."createdAt", "originalWords".id'),
+]
+
+SEED_ROWS = 50
+
+# Statement -> (parameters, route that issued it)
+captured = {}
+current_route = None
+
+
+def capture_statement(conn, cursor, statement, parameters, context, executemany):
+    """Record each distinct read, update or delete statement with the route that ran it"""
+    if executemany or not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+        return
+    captured.setdefault(statement, (parameters, current_route))
+
+
+async def call(method: str, path: str, body=None, token: str = None):
+    """Call a route through the ASGI app and return (status, headers, JSON body)"""
+    global current_route
+    current_route = f"{method} {path}"
+    route_path, _, query = path.partition("?")
+    headers = [(b"content-type", b"application/json")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": route_path,
+        "raw_path": route_path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+    response = {"headers": {}, "body": b""}
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # Like a server, report a disconnect only when the client goes away, which it never does here
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {key.decode(): value.decode() for key, value in message["headers"]}
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    is_json = response["headers"].get("content-type", "").startswith("application/json")
+    content = json.loads(response["body"]) if response["body"] and is_json else None
+    if response["status"] >= 400 and response["status"] != 404:
+        raise RuntimeError(f"{current_route} returned {response['status']}: {content}")
+    return response["status"], response["headers"], content
+
+
+async def exercise_routes():
+    """Seed a learner's history and call every route that reads or updates it"""
+    learner = {
+        "accessCode": "plans", "guardianName": "Guardian", "learnerName": "Learner",
+        "username": "plans", "password": "plans-password"
+    }
+    _, _, body = await call("POST", "/api/register", learner)
+    token, user_id = body["access_token"], body["user"]["userId"]
+    await call("POST", "/api/login", {"username": "plans", "password": "plans-password"})
+
+    for i in range(SEED_ROWS):
+        module = ("Alphabet", "Reading", "Games")[i % 3]
+        await call("POST", "/api/progress", {"moduleName": module, "score": i * 2, "completed": i % 2, "timeSpent": 30}, token)
+        await call("POST", "/api/quiz/attempt", {"quizType": ("alphabet", "words")[i % 2], "isCorrect": i % 2}, token)
+        await call("POST", "/api/pronunciation/attempt", {"targetWord": "abeja", "accuracyScore": i}, token)
+    journal = [
+        {"seq": i, "clientEventId": str(uuid.uuid4()), "event": journal_event}
+        for i, journal_event in enumerate([
+            {"type": "progress", "moduleName": "Reading", "score": 50},
+            {"type": "quiz", "quizType": "words", "isCorrect": 1},
+            {"type": "pronunciation", "targetWord": "abeja", "accuracyScore": 80},
+        ])
+    ]
+    await call("POST", "/api/sync/journal", journal, token)
+    _, _, learning_session = await call("POST", "/api/session/start", token=token)
+    await call("PUT", f"/api/session/{learning_session['id']}", {"sessionStart": learning_session["sessionStart"], "totalTimeSpent": 300}, token)
+
+    _, headers, _ = await call("GET", "/api/progress?limit=10", token=token)
+    await call("GET", f"/api/progress?limit=10&cursor={headers['x-next-cursor']}", token=token)
+    await call("GET", "/api/progress?module=Reading&limit=10", token=token)
+    _, headers, _ = await call("GET", "/api/quiz/attempts?limit=10", token=token)
+    await call("GET", f"/api/quiz/attempts?limit=10&cursor={headers['x-next-cursor']}", token=token)
+    await call("GET", "/api/quiz/attempts?quiz_type=words&limit=10", token=token)
+    await call("GET", "/api/analytics/overview", token=token)
+    await call("GET", "/api/analytics/module/Reading", token=token)
+    await call("GET", "/api/analytics/modules?language=english&since=2000-01-01T00:00:00", token=token)
+    await call("GET", "/api/analytics/attempts/daily?since=2000-01-01", token=token)
+    await call("GET", "/api/export/history", token=token)
+
+    await call("GET", "/api/me", token=token)
+    await call("GET", f"/api/users/{user_id}", token=token)
+    await call("PUT", f"/api/users/{user_id}", {**learner, "guardianName": "Updated"}, token)
+    await call("POST", "/api/register/bulk", [{**learner, "username": "plans2", "accessCode": "plans2"}], token)
+
+    _, _, member = await call("POST", "/api/family-members", {"name": "Ana", "relation": "mother"}, token)
+    await call("GET", "/api/family-members", token=token)
+    await call("DELETE", f"/api/family-members/{member['id']}", token=token)
+    _, _, reading_text = await call("POST", "/api/reading-texts", {"title": "Abc", "content": "Abc"}, token)
+    await call("GET", "/api/reading-texts", token=token)
+    await call("GET", f"/api/reading-texts/{reading_text['id']}", token=token)
+    await call("DELETE", f"/api/reading-texts/{reading_text['id']}", token=token)
+
+    _, _, word = await call("POST", "/api/words", {"englishName": "Bee", "spanishName": "Abeja", "initials": "Bb", "type": "animal"}, token)
+    await call("POST", "/api/words", {"englishName": "Fan", "spanishName": "Abanico", "initials": "Ff"}, token)
+    await call("PUT", f"/api/words/{word['id']}", {"englishName": "Bee", "tema": "insects"}, token)
+    await call("POST", "/api/words/bulk", {"upserts": [{"englishName": "Fan", "tema": "home"}], "deletes": [{"englishName": "Bee"}]}, token)
+    await call("GET", "/api/words?limit=1")
+    await call("GET", "/api/words/changes?since=1")
+    await call("GET", "/api/words/search?q=aba")
+    await call("GET", f"/api/words/{word['id']}")
+    await call("DELETE", f"/api/words/{word['id'] + 1}", token=token)
+
+
+def check_plans() -> int:
+    """EXPLAIN every captured statement and report full table scans"""
+    engine = create_db_engine(DATABASE_URL)
+    failures = 0
+    with engine.connect() as conn:
+        for statement, (parameters, route) in captured.items():
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            scans = []
+            for row in plan:
+                detail = row[-1]
+                if not detail.startswith("SCAN ") or "VIRTUAL TABLE" in detail:
+                    continue
+                table = detail.split()[1]
+                if table not in Base.metadata.tables:
+                    # Constant rows and subqueries, not stored tables
+                    continue
+                if any(table == allowed and marker in statement for allowed, marker in ALLOWED_SCANS):
+                    continue
+                scans.append(detail)
+            if scans:
+                failures += 1
+                print(f"❌ {route}")
+                print(f"   {' '.join(statement.split())}")
+                for detail in scans:
+                    print(f"   -> {detail}")
+    engine.dispose()
+    return failures
+
+
+async def main():
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture_statement)
+    # Run the app's startup (schema creation) and shutdown around the calls
+    async with app.router.lifespan_context(app):
+        await exercise_routes()
+
+
+if __name__ == "__main__":
+    print("🚀 Query Plan Check")
+    print("=" * 60)
+    asyncio.run(main())
+    failures = check_plans()
+    print("=" * 60)
+    if failures:
+        print(f"❌ {failures} of {len(captured)} statements scan a full table")
+        sys.exit(1)
+    print(f"✅ All {len(captured)} statements use an index")
@@ -0,0 +1,97 @@
+"""
+Check the analytics rollup tables against the raw progress and session rows
+
+Recomputes moduleRollups and sessionRollups from learnerProgress and
+learningSessions and reports every row that differs. With --rebuild the
+rollup tables are replaced by the recomputed rows in one transaction; run it
+whenever the check fails, while the API is not taking writes. (Empty rollup
+tables of an upgraded database are built by init_db on startup.) Exits with status 1 if
+differences remain.
+
+Run from the backend directory:
+    python -m scripts.check_rollups [--rebuild]
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy import delete, insert, select
+from app.database import SessionLocal, init_db
+from app.models import ModuleRollup, SessionRollup
+from app.core.rollups import MODULE_COUNTS, SESSION_COUNTS, module_totals, session_totals
+
+# (rollup model, primary key columns, compared columns, select of the recomputed rows)
+ROLLUPS = (
+    (ModuleRollup, ("userId", "moduleName"), MODULE_COUNTS + ("lastActivityAt",), module_totals),
+    (SessionRollup, ("userId",), SESSION_COUNTS + ("lastSessionAt",), session_totals),
+)
+
+
+def compare(db, model, key: tuple, columns: tuple, totals) -> tuple:
+    """Return (recomputed rows, number of rows that are missing, stale or extra)"""
+    expected = {tuple(row[name] for name in key): dict(row) for row in db.execute(totals()).mappings()}
+    stored = {
+        tuple(getattr(row, name) for name in key): row
+        for row in db.scalars(select(model))
+    }
+
+    differences = 0
+    for row_key in expected.keys() | stored.keys():
+        want, have = expected.get(row_key), stored.get(row_key)
+        if have is None:
+            problem = "missing"
+        elif want is None:
+            problem = "extra"
+        elif any(want[name] != getattr(have, name) for name in columns):
+            problem = "stale: " + ", ".join(
+                f"{name} {getattr(have, name)} != {want[name]}"
+                for name in columns if want[name] != getattr(have, name)
+            )
+        else:
+            continue
+        differences += 1
+        if differences <= 20:
+            print(f"   {model.__tablename__} {row_key}: {problem}")
+    return list(expected.values()), differences
+
+
+def check_rollups(rebuild: bool) -> int:
+    """Compare every rollup table, optionally rebuilding it, and return the remaining differences"""
+    db = SessionLocal()
+    remaining = 0
+    try:
+        for model, key, columns, totals in ROLLUPS:
+            rows, differences = compare(db, model, key, columns, totals)
+            if not differences:
+                print(f"✅ {model.__tablename__}: {len(rows)} rows match")
+                continue
+            if not rebuild:
+                print(f"❌ {model.__tablename__}: {differences} rows differ")
+                remaining += differences
+                continue
+            db.execute(delete(model))
+            if rows:
+                db.execute(insert(model), rows)
+            db.commit()
+            print(f"✅ {model.__tablename__}: rebuilt {len(rows)} rows ({differences} differed)")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        db.rollback()
+        remaining += 1
+    finally:
+        db.close()
+    return remaining
+
+
+if __name__ == "__main__":
+    rebuild = "--rebuild" in sys.argv[1:]
+
+    print("🚀 Analytics Rollup Check")
+    print("=" * 60)
+    init_db()
+    if check_rollups(rebuild):
+        sys.exit(1)
@@ -4,17 +4,22 @@ Import words from originalWords.sql to database
 Run from the backend directory:
     python -m scripts.import_words_from_sql
 """
-import sqlite3
 import re
 import os
+from datetime import datetime
+
+from sqlalchemy import insert, update
+from app.database import SessionLocal
+from app.models import OriginalWord
+from app.core.catalog import bump_catalog_version
+from app.core.media import to_media_key
 
 # Get the project root directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.dirname(script_dir)
 
-# Paths to data files
+# Path to the data file
 sql_file = os.path.join(backend_dir, 'data', 'originalWords.sql')
-db_file = os.path.join(backend_dir, 'data', 'miabc.db')
 
 # Read SQL file
 with open(sql_file, 'r', encoding='utf-8') as f:
@@ -36,15 +41,21 @@ tuples = re.findall(r'\((.*?)\)(?:,|\s*$)', values_section, re.DOTALL)
 print(f"Found {len(tuples)} word entries in SQL file")
 
 # Connect to database
-conn = sqlite3.connect(db_file)
-cursor = conn.cursor()
+db = SessionLocal()
+now = datetime.utcnow()
 
-# Clear existing words
-cursor.execute('DELETE FROM originalWords')
+# Stamp the import with a new catalog version so running servers and syncing
+# clients pick it up; existing words are retired as tombstones, not deleted
+version = bump_catalog_version(db)
+db.execute(
+    update(OriginalWord)
+    .where(OriginalWord.deletedAt.is_(None))
+    .values(deletedAt=now, updatedAt=now, version=version)
+)
 print("Cleared existing words")
 
 # Insert words
-inserted = 0
+rows = []
 for tuple_str in tuples:
     # Parse values
     values = tuple_str.split(',')
@@ -55,12 +66,12 @@ for tuple_str in tuples:
     
     try:
         english_name = values[1].strip().strip("'")
-        english_sound = values[2].strip().strip("'")
-        image_path = values[3].strip().strip("'")
+        english_sound = to_media_key(values[2].strip().strip("'"))
+        image_path = to_media_key(values[3].strip().strip("'"))
         initials = values[4].strip().strip("'")
         record_flag = values[8].strip().strip("'")
         spanish_name = values[10].strip().strip("'")
-        spanish_sound = values[11].strip().strip("'")
+        spanish_sound = to_media_key(values[11].strip().strip("'"))
         tamil_word = values[12].strip()
         tamil_pronunciation = values[13].strip()
         key_val = values[14].strip()
@@ -73,23 +84,24 @@ for tuple_str in tuples:
         tamil_pronunciation = None if tamil_pronunciation == 'NULL' else tamil_pronunciation.strip("'")
         key_val = None if key_val == 'NULL' else key_val.strip("'")
         
-        cursor.execute("""
-            INSERT INTO originalWords 
-            (englishName, englishSound, spanishName, spanishSound, tamilWord, tamilPronunciation, 
-             imagePath, initials, recordFlag, key, type, tema, letra, createdAt)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-        """, (english_name, english_sound, spanish_name, spanish_sound, tamil_word, tamil_pronunciation,
-              image_path, initials, record_flag, key_val, word_type, tema, letra))
-        
-        inserted += 1
+        rows.append({
+            "englishName": english_name, "englishSound": english_sound,
+            "spanishName": spanish_name, "spanishSound": spanish_sound,
+            "tamilWord": tamil_word, "tamilPronunciation": tamil_pronunciation,
+            "imagePath": image_path, "initials": initials, "recordFlag": record_flag,
+            "key": key_val, "type": word_type, "tema": tema, "letra": letra,
+            "createdAt": now, "updatedAt": now, "version": version,
+        })
         
     except Exception as e:
-        print(f"Error inserting word: {e}")
+        print(f"Error parsing word: {e}")
         print(f"Values: {values[:5]}")
         continue
 
-conn.commit()
-conn.close()
+if rows:
+    db.execute(insert(OriginalWord), rows)
+db.commit()
+db.close()
 
-print(f"\n✅ Successfully imported {inserted} words!")
+print(f"\n✅ Successfully imported {len(rows)} words (catalog version {version})!")
 print(f"\nRun 'python -m scripts.view_database' to verify")
@@ -0,0 +1,26 @@
+"""
+Create missing tables, columns and indexes, including the word search index
+
+Run once per deployment when the server starts with AUTO_CREATE_SCHEMA=false.
+Run from the backend directory:
+    python -m scripts.init_database
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+from app import models  # Registers every table with the metadata
+from app.database import engine, init_db
+from app.core.search import init_word_search
+
+
+if __name__ == "__main__":
+    print("🚀 Database Schema Setup")
+    print("=" * 60)
+    init_db()
+    init_word_search(engine)
+    print(f"✅ Schema is up to date ({engine.url.render_as_string(hide_password=True)})")
@@ -16,13 +16,9 @@ sys.path.insert(0, backend_dir)
 # Change working directory to backend so relative paths work correctly
 os.chdir(backend_dir)
 
-from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine
+from app.database import SessionLocal, init_db
 from app.models import OriginalWord
-from app.database import Base
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from app.core.catalog import bump_catalog_version
 
 # Tamil data: englishName -> (tamilWord, tamilPronunciation)
 # Extracted from spreadsheet images
@@ -356,35 +352,44 @@ def inject_tamil_data():
     try:
         updated = 0
         not_found = []
+        # Deleted words are tombstones kept for syncing clients, never updated
+        live_words = db.query(OriginalWord).filter(OriginalWord.deletedAt.is_(None))
+        # Stamp the updates with a new catalog version, in the same transaction,
+        # so running servers and syncing clients pick them up
+        version = bump_catalog_version(db)
         
         for english_name, (tamil_word, tamil_pronunciation) in TAMIL_DATA.items():
             # Try exact match first
-            word = db.query(OriginalWord).filter(
+            word = live_words.filter(
                 OriginalWord.englishName == english_name
             ).first()
             
             # Try case-insensitive match
             if not word:
-                word = db.query(OriginalWord).filter(
+                word = live_words.filter(
                     OriginalWord.englishName.ilike(english_name)
                 ).first()
             
             if word:
                 word.tamilWord = tamil_word
                 word.tamilPronunciation = tamil_pronunciation
+                word.version = version
                 updated += 1
                 print(f"✅ Updated: {english_name} -> {tamil_word} ({tamil_pronunciation})")
             else:
                 not_found.append(english_name)
         
-        db.commit()
+        if updated:
+            db.commit()
+        else:
+            db.rollback()
         
         # Stats
-        total_with_tamil = db.query(OriginalWord).filter(
+        total_with_tamil = live_words.filter(
             OriginalWord.tamilWord.isnot(None),
             OriginalWord.tamilWord != ''
         ).count()
-        total_words = db.query(OriginalWord).count()
+        total_words = live_words.count()
         
         print(f"\n{'='*60}")
         print(f"📊 SUMMARY")
@@ -410,4 +415,5 @@ if __name__ == "__main__":
     print("=" * 60)
     print("This will update existing words with Tamil translations")
     print("=" * 60)
+    init_db()
     inject_tamil_data()
@@ -0,0 +1,60 @@
+"""
+Rewrite word media columns from full Firebase URLs to storage keys
+
+Run from the backend directory:
+    python -m scripts.migrate_media_keys
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy import update
+from app.database import SessionLocal, init_db
+from app.models import OriginalWord
+from app.core.media import MEDIA_FIELDS, to_media_key
+from app.core.catalog import bump_catalog_version
+
+
+def migrate_media_keys():
+    """Replace media URLs with storage keys, stamping changed rows with a new catalog version"""
+    db = SessionLocal()
+
+    try:
+        columns = [getattr(OriginalWord, field) for field in MEDIA_FIELDS]
+        rows = db.query(OriginalWord.id, *columns).all()
+
+        changes = []
+        for row in rows:
+            values = {field: to_media_key(getattr(row, field)) for field in MEDIA_FIELDS}
+            if any(values[field] != getattr(row, field) for field in MEDIA_FIELDS):
+                changes.append({"id": row.id, **values})
+
+        if not changes:
+            print("✅ All media columns already store keys")
+            return
+
+        version = bump_catalog_version(db)
+        db.execute(update(OriginalWord), [{**change, "version": version} for change in changes])
+        db.commit()
+
+        print(f"✅ Rewrote media for {len(changes)} of {len(rows)} words (catalog version {version})")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("🚀 Media Key Migration Script")
+    print("=" * 60)
+    print("This will shorten media URLs in originalWords to storage keys")
+    print("=" * 60)
+    # Make sure the catalog version columns exist
+    init_db()
+    migrate_media_keys()
@@ -13,13 +13,10 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.dirname(script_dir)
 sys.path.insert(0, backend_dir)
 
-from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine
+from app.database import SessionLocal, init_db
 from app.models import OriginalWord
-from app.database import Base
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from app.core.media import MEDIA_FIELDS, to_media_key
+from app.core.catalog import bump_catalog_version
 
 # Sample words with Tamil translations
 SAMPLE_WORDS = [
@@ -153,8 +150,9 @@ def populate_database():
     db = SessionLocal()
     
     try:
-        # Check if words already exist
-        existing_words = db.query(OriginalWord).count()
+        # Check if words already exist (deleted words are tombstones, not words)
+        live_words = db.query(OriginalWord).filter(OriginalWord.deletedAt.is_(None))
+        existing_words = live_words.count()
         
         if existing_words > 0:
             print(f"⚠️ Database already has {existing_words} words")
@@ -163,25 +161,36 @@ def populate_database():
                 print("Cancelled.")
                 return
         
+        # Stamp the new words with a new catalog version, in the same transaction,
+        # so running servers and syncing clients pick them up
+        version = bump_catalog_version(db)
+        
         # Add sample words
         added = 0
         for word_data in SAMPLE_WORDS:
             # Check if word already exists
-            existing = db.query(OriginalWord).filter(
+            existing = live_words.filter(
                 OriginalWord.englishName == word_data["englishName"]
             ).first()
             
             if not existing:
-                word = OriginalWord(**word_data)
+                word = OriginalWord(**word_data, version=version)
+                for field in MEDIA_FIELDS:
+                    setattr(word, field, to_media_key(getattr(word, field)))
                 db.add(word)
                 added += 1
                 print(f"✅ Added: {word_data['englishName']} / {word_data['spanishName']} / {word_data['tamilWord']}")
             else:
                 print(f"⏭️ Skipped (exists): {word_data['englishName']}")
         
+        if not added:
+            db.rollback()
+            print("\nNo new words to add")
+            return
+        
         db.commit()
-        print(f"\n🎉 Successfully added {added} words with Tamil translations!")
-        print(f"📊 Total words in database: {db.query(OriginalWord).count()}")
+        print(f"\n🎉 Successfully added {added} words with Tamil translations (catalog version {version})!")
+        print(f"📊 Total words in database: {live_words.count()}")
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -196,4 +205,5 @@ if __name__ == "__main__":
     print("This will add sample words with Tamil translations")
     print("All words include Firebase storage URLs for audio and images")
     print("=" * 50)
+    init_db()
     populate_database()